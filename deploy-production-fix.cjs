@@ -99,11 +99,45 @@ function installDependencies() {
   return true;
 }
 
+// Newest modification time (ms) of any source file under dir
+function newestSourceMtime(dir) {
+  let newest = 0;
+  if (!fs.existsSync(dir)) {
+    return newest;
+  }
+  for (const entry of fs.readdirSync(dir, { withFileTypes: true })) {
+    const entryPath = path.join(dir, entry.name);
+    if (entry.isDirectory()) {
+      if (entry.name !== 'node_modules') {
+        newest = Math.max(newest, newestSourceMtime(entryPath));
+      }
+    } else if (/\.(ts|tsx|js|cjs|mjs|json)$/.test(entry.name)) {
+      newest = Math.max(newest, fs.statSync(entryPath).mtimeMs);
+    }
+  }
+  return newest;
+}
+
+// The server bundle is current when it is newer than every server/shared
+// source file and the lockfile (package.json is rewritten on every run by
+// fixPackageJson, so it is deliberately not compared)
+function isServerBundleFresh() {
+  const bundlePath = 'dist/index.js';
+  if (!fs.existsSync(bundlePath)) {
+    return false;
+  }
+  const bundleMtime = fs.statSync(bundlePath).mtimeMs;
+  const lockMtime = fs.existsSync('package-lock.json') ? fs.statSync('package-lock.json').mtimeMs : 0;
+  return bundleMtime >= Math.max(newestSourceMtime('server'), newestSourceMtime('shared'), lockMtime);
+}
+
 function buildApplication() {
   console.log('\n🏗️  Building application...');
   
-  // Try the standard build process
-  if (runCommand('npm run build:server', 'Building server')) {
+  if (isServerBundleFresh()) {
+    console.log('✅ Server bundle is up to date, skipping server build');
+  } else if (runCommand('npm run build:server', 'Building server')) {
+    // Try the standard build process
     console.log('✅ Server build successful');
   } else {
     // Fallback: build server manually
@@ -134,7 +168,6 @@ function createStartScript() {
  * Production Start Script for Burnt Beats
  */
 
-const { spawn } = require('child_process');
 const fs = require('fs');
 const path = require('path');
 
@@ -146,33 +179,17 @@ if (!fs.existsSync('dist/index.js')) {
   process.exit(1);
 }
 
-// Start the production server
-const serverProcess = spawn('node', ['dist/index.js'], {
-  stdio: 'inherit',
-  cwd: process.cwd(),
-  env: { ...process.env, NODE_ENV: 'production' }
-});
+// Start the production server in this process rather than a child, so
+// there is no idle parent and signals reach the server's own shutdown
+// handlers directly
+process.env.NODE_ENV = 'production';
 
-serverProcess.on('error', (error) => {
+try {
+  require(path.resolve('dist/index.js'));
+} catch (error) {
   console.error('❌ Failed to start server:', error);
   process.exit(1);
-});
-
-serverProcess.on('close', (code) => {
-  console.log(\`🛑 Server exited with code \${code}\`);
-  process.exit(code);
-});
-
-// Handle graceful shutdown
-process.on('SIGINT', () => {
-  console.log('\\n🛑 Shutting down server...');
-  serverProcess.kill('SIGINT');
-});
-
-process.on('SIGTERM', () => {
-  console.log('\\n🛑 Shutting down server...');
-  serverProcess.kill('SIGTERM');
-});
+}
 `;
 
   fs.writeFileSync('start-production.cjs', startScript);
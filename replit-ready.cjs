@@ -107,11 +107,31 @@ let buildOk = buildCheck.success;
 
 console.log('\n🧪 Checking Core Scripts...');
 let scriptsOk = true;
-scriptsOk &= runCommand('node -e "console.log(\'Node.js works\')"', 'Node.js functionality').success;
+// This script is itself running on Node, so report the live runtime
+// instead of forking another node process to prove it works
+console.log('\n📦 Node.js functionality...');
+console.log(`✅ Node.js functionality - OK (${process.version})`);
+
+// Resolve a locally installed tsx without going through npx; only fall
+// back to spawning when it is not in node_modules
+function localTsxVersion() {
+  try {
+    return require(require.resolve('tsx/package.json', { paths: [process.cwd()] })).version;
+  } catch (e) {
+    return null;
+  }
+}
 
 // Check if tsx can run
 try {
-  const tsxCheck = runCommand('npx tsx --version', 'TypeScript execution (tsx)');
+  const tsxVersion = localTsxVersion();
+  if (tsxVersion) {
+    console.log('\n📦 TypeScript execution (tsx)...');
+    console.log(`✅ TypeScript execution (tsx) - OK (${tsxVersion})`);
+  }
+  const tsxCheck = tsxVersion
+    ? { success: true }
+    : runCommand('npx tsx --version', 'TypeScript execution (tsx)');
   if (!tsxCheck.success) {
     console.log('⚠️ tsx not available, trying alternative...');
     scriptsOk &= runCommand('node --loader=ts-node/esm --version', 'Alternative TypeScript loader').success;
@@ -8,12 +8,16 @@ Analyzes .afpk files to determine if they contain extractable audio/MIDI data
 import os
 import struct
 import json
+import shutil
 from pathlib import Path
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Extracted payloads are streamed in 1 MiB chunks rather than read whole
+COPY_CHUNK_SIZE = 1 << 20
+
 class AFPKAnalyzer:
     def __init__(self):
         self.afpk_files = []
@@ -115,14 +119,14 @@ class AFPKAnalyzer:
                 wav_path = Path(f"storage/temp/{afpk_path.stem}.wav")
                 wav_path.parent.mkdir(parents=True, exist_ok=True)
                 with open(afpk_path, 'rb') as src, open(wav_path, 'wb') as dst:
-                    dst.write(src.read())
+                    shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
                 extraction_attempts.append({'format': 'WAV', 'path': str(wav_path)})
             
             if 'MIDI' in analysis.get('potential_formats', []):
                 mid_path = Path(f"storage/temp/{afpk_path.stem}.mid")
                 mid_path.parent.mkdir(parents=True, exist_ok=True)
                 with open(afpk_path, 'rb') as src, open(mid_path, 'wb') as dst:
-                    dst.write(src.read())
+                    shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
                 extraction_attempts.append({'format': 'MIDI', 'path': str(mid_path)})
             
             if 'JSON' in analysis.get('potential_formats', []):
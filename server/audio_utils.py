@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Shared audio helpers for the Burnt Beats voice scripts
+Imported by rvc-integration.py and voice-sample-processor.py
+"""
+
+from typing import Tuple
+
+import librosa
+import numpy as np
+import soundfile as sf
+from scipy import fft as scipy_fft
+
+# Route librosa's STFTs through scipy.fft: it keeps float32 frames in single
+# precision (numpy.fft upcasts to float64 before NumPy 2) and caches plans
+# for the fixed FFT sizes used here
+librosa.set_fftlib(scipy_fft)
+
+def peak_normalize(audio: np.ndarray) -> np.ndarray:
+    """Scale audio to unit peak, like librosa.util.normalize for 1-D input"""
+    # |x|.max() == max(x.max(), -x.min()) for real signals, so the peak
+    # comes from two reductions without materializing np.abs(audio)
+    if audio.size == 0:
+        return audio
+    peak = max(float(audio.max()), -float(audio.min()))
+    if peak <= np.finfo(audio.dtype).tiny:
+        return audio
+    return audio / audio.dtype.type(peak)
+
+def load_audio(audio_path, sr: int) -> Tuple[np.ndarray, int]:
+    """Decode audio to mono float32 at sr, like librosa.load(audio_path, sr=sr)"""
+    # libsndfile decodes WAV/FLAC/OGG straight to float32; librosa.load is
+    # only needed for formats it cannot open (it falls back to audioread)
+    try:
+        with sf.SoundFile(str(audio_path)) as f:
+            native_sr = f.samplerate
+            audio = f.read(dtype='float32', always_2d=False)
+    except (sf.SoundFileError, RuntimeError):
+        return librosa.load(audio_path, sr=sr)
+    if audio.ndim == 2:
+        audio = audio.mean(axis=1, dtype=np.float32)
+    if native_sr != sr:
+        # librosa>=0.10 resamples with soxr_hq, as librosa.load does
+        audio = librosa.resample(audio, orig_sr=native_sr, target_sr=sr)
+    return audio, sr
@@ -5,13 +5,19 @@ Chord progression processor for uploaded chord sets
 """
 
 import os
+import re
 import json
 import zipfile
 import tempfile
+from itertools import groupby
 from pathlib import Path
 from typing import List, Dict, Any
 import mido
-from music21 import stream, chord, key, pitch, meter, tempo, metronome
+from music21 import stream, chord, key, note, meter, tempo
+
+# Whitespace-delimited token starting with a chord root, optionally preceded
+# by a flat/sharp sign (e.g. "Am", "G7", "#F")
+CHORD_TOKEN_RE = re.compile(r'(?<!\S)[b#]?[A-G]\S*')
 
 
 class ChordProcessor:
@@ -56,28 +62,25 @@ class ChordProcessor:
         progressions = []
         metadata = {"file_count": 0, "formats": []}
         
+        # Route each file to its handler by extension
+        handlers = {
+            '.mid': (self._process_midi_chords, "MIDI"),
+            '.midi': (self._process_midi_chords, "MIDI"),
+            '.txt': (self._process_text_chords, "Text"),
+            '.chord': (self._process_text_chords, "Text"),
+            '.json': (self._process_json_chords, "JSON"),
+        }
         for file_path in Path(directory).rglob("*"):
-            if file_path.is_file():
-                metadata["file_count"] += 1
-                
-                # Process different file types
-                if file_path.suffix.lower() in ['.mid', '.midi']:
-                    prog_data = self._process_midi_chords(file_path)
-                    if prog_data:
-                        progressions.append(prog_data)
-                        metadata["formats"].append("MIDI")
-                
-                elif file_path.suffix.lower() in ['.txt', '.chord']:
-                    prog_data = self._process_text_chords(file_path)
-                    if prog_data:
-                        progressions.append(prog_data)
-                        metadata["formats"].append("Text")
-                
-                elif file_path.suffix.lower() == '.json':
-                    prog_data = self._process_json_chords(file_path)
-                    if prog_data:
-                        progressions.append(prog_data)
-                        metadata["formats"].append("JSON")
+            if not file_path.is_file():
+                continue
+            metadata["file_count"] += 1
+            handler = handlers.get(file_path.suffix.lower())
+            if handler:
+                process, file_format = handler
+                prog_data = process(file_path)
+                if prog_data:
+                    progressions.append(prog_data)
+                    metadata["formats"].append(file_format)
         
         return {
             "progressions": progressions,
@@ -93,28 +96,34 @@ class ChordProcessor:
             score = stream.Score()
             part = stream.Part()
             
-            # Convert MIDI to music21 format
-            for msg in mid.play():
+            # Convert MIDI to music21 format in one pass over the merged
+            # tracks (mid.play() sleeps in real time between messages),
+            # picking up the first tempo change along the way
+            note_numbers = []
+            bpm = None
+            for msg in mid:
                 if msg.type == 'note_on' and msg.velocity > 0:
-                    # Add note to stream
-                    note = pitch.Pitch(msg.note)
-                    part.append(note)
+                    note_numbers.append(msg.note)
+                elif bpm is None and msg.type == 'set_tempo':
+                    bpm = int(mido.tempo2bpm(msg.tempo))
+            part.append([note.Note(n) for n in note_numbers])
             
             score.append(part)
             
             # Analyze chords
             chords = score.chordify()
-            chord_symbols = []
-            
-            for element in chords.flat:
-                if isinstance(element, chord.Chord):
-                    chord_symbols.append(element.pitchedCommonName)
+            # recurse() walks the existing hierarchy in place; .flat would
+            # build a whole new flattened stream just to iterate it
+            chord_symbols = [
+                element.pitchedCommonName
+                for element in chords.recurse().getElementsByClass(chord.Chord)
+            ]
             
             return {
                 "filename": file_path.name,
                 "type": "MIDI",
                 "chord_progression": chord_symbols,
-                "tempo": self._extract_tempo(mid),
+                "tempo": bpm if bpm is not None else 120,  # Default tempo
                 "time_signature": "4/4"  # Default, could be analyzed
             }
             
@@ -134,13 +143,7 @@ class ChordProcessor:
             
             for line in lines:
                 # Look for chord patterns like "C Am F G"
-                words = line.strip().split()
-                potential_chords = []
-                
-                for word in words:
-                    # Basic chord detection
-                    if self._is_chord_symbol(word):
-                        potential_chords.append(word)
+                potential_chords = CHORD_TOKEN_RE.findall(line)
                 
                 if potential_chords:
                     chord_patterns.append(potential_chords)
@@ -172,56 +175,38 @@ class ChordProcessor:
             print(f"Error processing JSON file {file_path}: {e}")
             return None
     
-    def _is_chord_symbol(self, text: str) -> bool:
-        """Basic chord symbol detection"""
-        # Enhanced chord detection
-        chord_roots = ['C', 'D', 'E', 'F', 'G', 'A', 'B']
-        modifiers = ['m', 'maj', 'min', '7', '9', '11', '13', 'sus', 'add', 'dim', 'aug']
-        
-        if not text or len(text) < 1:
-            return False
-        
-        # Check if starts with chord root
-        if text[0] in chord_roots:
-            return True
-        
-        # Check for flat/sharp notation
-        if len(text) > 1 and text[0] in ['b', '#'] and text[1] in chord_roots:
-            return True
-        
-        return False
-    
-    def _extract_tempo(self, mid: mido.MidiFile) -> int:
-        """Extract tempo from MIDI file"""
-        for track in mid.tracks:
-            for msg in track:
-                if msg.type == 'set_tempo':
-                    return int(mido.tempo2bpm(msg.tempo))
-        return 120  # Default tempo
-    
     def generate_midi_from_chords(self, chord_progression: List[str], 
                                  tempo: int = 120, 
                                  output_path: str = None) -> str:
         """Generate MIDI file from chord progression"""
         try:
-            # Create music21 stream
-            score = stream.Score()
-            part = stream.Part()
+            # Write the track with mido directly; music21 is only used to
+            # parse chord symbols into pitches
+            mid = mido.MidiFile()
+            track = mido.MidiTrack()
+            mid.tracks.append(track)
             
             # Add tempo
-            part.append(metronome.MetronomeMark(number=tempo))
+            track.append(mido.MetaMessage('set_tempo', tempo=mido.bpm2tempo(tempo)))
             
-            # Add chords
-            for chord_symbol in chord_progression:
+            # Add chords; each run of a repeated symbol is parsed once and
+            # its note on/off messages are reused for every repeat
+            ticks_per_chord = mid.ticks_per_beat * 4  # Whole note
+            for chord_symbol, run in groupby(chord_progression):
                 try:
-                    chord_obj = chord.Chord(chord_symbol)
-                    chord_obj.quarterLength = 4.0  # Whole note
-                    part.append(chord_obj)
+                    chord_notes = [p.midi for p in chord.Chord(chord_symbol).pitches]
                 except:
                     # Skip invalid chord symbols
                     continue
-            
-            score.append(part)
+                
+                messages = [mido.Message('note_on', note=n, velocity=64, time=0)
+                            for n in chord_notes]
+                messages.extend(
+                    mido.Message('note_off', note=n, velocity=64,
+                                 time=ticks_per_chord if j == 0 else 0)
+                    for j, n in enumerate(chord_notes)
+                )
+                track.extend(messages * sum(1 for _ in run))
             
             # Generate output path if not provided
             if not output_path:
@@ -230,7 +215,7 @@ class ChordProcessor:
                 output_path = f"./storage/midi/generated/chord_progression_{len(chord_progression)}_chords.mid"
             
             # Write MIDI file
-            score.write('midi', fp=output_path)
+            mid.save(output_path)
             
             return output_path
             
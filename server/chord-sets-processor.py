@@ -17,6 +17,8 @@ class ChordSetsProcessor:
         self.source_dir = Path(source_dir)
         self.target_dir = Path(target_dir)
         self.chord_sets_dir = self.target_dir / "chord-sets"
+        self._catalog_cache = None
+        self._catalog_mtime = None
         
     def analyze_chord_midi(self, midi_path):
         """Analyze a MIDI file for chord progressions"""
@@ -34,38 +36,44 @@ class ChordSetsProcessor:
                 "note_events": []
             }
             
-            # Analyze tracks for chord data
+            # Analyze tracks for chord data; result-list appends are bound
+            # once so the per-message loop only does the event dispatch
+            add_chord = analysis["chord_progression"].append
+            add_tempo = analysis["tempo_changes"].append
+            add_key = analysis["key_signatures"].append
+            
             for track_idx, track in enumerate(mid.tracks):
                 current_time = 0
                 active_notes = set()
                 
                 for msg in track:
                     current_time += msg.time
+                    msg_type = msg.type
                     
-                    if msg.type == 'note_on' and msg.velocity > 0:
+                    if msg_type == 'note_on' and msg.velocity > 0:
                         active_notes.add(msg.note)
                         
                         # Detect chord when 3+ notes are active
                         if len(active_notes) >= 3:
-                            chord_notes = sorted(list(active_notes))
-                            analysis["chord_progression"].append({
+                            add_chord({
                                 "time": current_time,
-                                "notes": chord_notes,
+                                "notes": sorted(active_notes),
                                 "track": track_idx
                             })
                             
-                    elif msg.type == 'note_off' or (msg.type == 'note_on' and msg.velocity == 0):
+                    elif msg_type == 'note_off' or msg_type == 'note_on':
+                        # note_on here means velocity 0, i.e. a note off
                         active_notes.discard(msg.note)
                         
-                    elif msg.type == 'set_tempo':
+                    elif msg_type == 'set_tempo':
                         bpm = mido.tempo2bpm(msg.tempo)
-                        analysis["tempo_changes"].append({
+                        add_tempo({
                             "time": current_time,
                             "bpm": round(bpm, 2)
                         })
                         
-                    elif msg.type == 'key_signature':
-                        analysis["key_signatures"].append({
+                    elif msg_type == 'key_signature':
+                        add_key({
                             "time": current_time,
                             "key": msg.key
                         })
@@ -194,15 +202,28 @@ class ChordSetsProcessor:
         
         return catalog
     
+    def _load_catalog(self):
+        """Load the chord sets catalog, reusing the parsed copy until the file changes"""
+        catalog_path = self.chord_sets_dir / "chord_sets_catalog.json"
+        
+        try:
+            mtime = os.stat(catalog_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        
+        if self._catalog_cache is None or mtime != self._catalog_mtime:
+            with open(catalog_path, 'r') as f:
+                self._catalog_cache = json.load(f)
+            self._catalog_mtime = mtime
+        
+        return self._catalog_cache
+    
     def get_chord_sets_by_category(self, category=None, tempo_range=None):
         """Get chord sets filtered by category and tempo"""
-        catalog_path = self.chord_sets_dir / "chord_sets_catalog.json"
+        catalog = self._load_catalog()
         
-        if not catalog_path.exists():
+        if catalog is None:
             return []
-            
-        with open(catalog_path, 'r') as f:
-            catalog = json.load(f)
         
         chord_sets = catalog.get("chord_sets", [])
         
@@ -12,9 +12,18 @@ import shutil
 from pathlib import Path
 from datetime import datetime
 import argparse
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
-logging.basicConfig(level=logging.INFO)
+# Per-file progress is logged heavily, so records are handed to a queue and
+# written to stderr by a background listener instead of on the caller
+_log_queue = queue.Queue(-1)
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)])
+_log_listener = QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
 class ComprehensiveMidiProcessor:
@@ -112,6 +121,10 @@ class ComprehensiveMidiProcessor:
             
             current_time = 0
             
+            # Note range is tracked in locals and stored once at the end,
+            # rather than two dict reads, min/max calls and writes per note
+            note_min, note_max = 127, 0
+            
             for track_idx, track in enumerate(mid.tracks):
                 track_info = {
                     'track_index': track_idx,
@@ -138,8 +151,10 @@ class ComprehensiveMidiProcessor:
                     # Note events
                     elif msg.type == 'note_on' and msg.velocity > 0:
                         track_info['notes'] += 1
-                        analysis['note_range']['min'] = min(analysis['note_range']['min'], msg.note)
-                        analysis['note_range']['max'] = max(analysis['note_range']['max'], msg.note)
+                        if msg.note < note_min:
+                            note_min = msg.note
+                        if msg.note > note_max:
+                            note_max = msg.note
                         
                         # Check if it's a drum track (channel 9)
                         if hasattr(msg, 'channel') and msg.channel == 9:
@@ -171,6 +186,8 @@ class ComprehensiveMidiProcessor:
                 
                 analysis['track_analysis'].append(track_info)
             
+            analysis['note_range'] = {'min': note_min, 'max': note_max}
+            
             # Determine estimated tempo
             if analysis['tempo_changes']:
                 analysis['estimated_tempo'] = analysis['tempo_changes'][0]['bpm']
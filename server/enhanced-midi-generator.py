@@ -5,13 +5,48 @@ Enhanced MIDI generator for Burnt Beats using chords2midi library
 """
 
 import argparse
-import json
 import sys
 import os
+from functools import lru_cache
+from itertools import cycle, islice
 from pathlib import Path
 
+from json_utils import write_json
+
+# Semitone offset of each natural note from C, plus accidental adjustments;
+# chord roots resolve to MIDI numbers in the octave starting at middle C
+NATURAL_PITCH_CLASSES = {'C': 0, 'D': 2, 'E': 4, 'F': 5, 'G': 7, 'A': 9, 'B': 11}
+ACCIDENTAL_OFFSETS = {'#': 1, 'b': -1}
+MIDDLE_C = 60
+
+# Chord quality suffix -> semitone intervals above the root
+CHORD_INTERVALS = {
+    '': (0, 4, 7),
+    'm': (0, 3, 7),
+    '7': (0, 4, 7, 10),
+    'm7': (0, 3, 7, 10),
+    'maj7': (0, 4, 7, 11),
+    'dim': (0, 3, 6),
+    'aug': (0, 4, 8),
+    'sus2': (0, 2, 7),
+    'sus4': (0, 5, 7),
+}
+
+# Genre -> four-bar chord progression
+GENRE_PROGRESSIONS = {
+    "pop": ["C", "Am", "F", "G"],
+    "rock": ["C", "F", "G", "C"],
+    "jazz": ["Cmaj7", "Am7", "Dm7", "G7"],
+    "blues": ["C7", "F7", "C7", "G7"],
+    "electronic": ["Cm", "Ab", "Eb", "Bb"],
+    "classical": ["C", "F", "G", "Am"],
+    "country": ["C", "F", "G", "C"],
+    "hip-hop": ["Cm", "Fm", "Gm", "Cm"]
+}
+
+@lru_cache(maxsize=None)
 def install_chords2midi():
-    """Install chords2midi if not available"""
+    """Install chords2midi if not available (checked once per process)"""
     try:
         import chords2midi
         return True
@@ -28,25 +63,15 @@ def install_chords2midi():
 
 def generate_chord_progression(genre, key="C", num_bars=8):
     """Generate genre-appropriate chord progressions"""
-    progressions = {
-        "pop": ["C", "Am", "F", "G"],
-        "rock": ["C", "F", "G", "C"],
-        "jazz": ["Cmaj7", "Am7", "Dm7", "G7"],
-        "blues": ["C7", "F7", "C7", "G7"],
-        "electronic": ["Cm", "Ab", "Eb", "Bb"],
-        "classical": ["C", "F", "G", "Am"],
-        "country": ["C", "F", "G", "C"],
-        "hip-hop": ["Cm", "Fm", "Gm", "Cm"]
-    }
-    
-    base_progression = progressions.get(genre.lower(), progressions["pop"])
+    base_progression = GENRE_PROGRESSIONS.get(genre.lower(), GENRE_PROGRESSIONS["pop"])
     
     # Extend progression to fill bars
-    full_progression = []
-    for i in range(num_bars):
-        full_progression.append(base_progression[i % len(base_progression)])
-    
-    return full_progression
+    return list(islice(cycle(base_progression), num_bars))
+
+def write_metadata(metadata, output_path):
+    """Write the metadata JSON alongside a generated MIDI file"""
+    metadata_path = output_path.replace('.mid', '_metadata.json')
+    write_json(metadata, metadata_path)
 
 def create_enhanced_midi(title, theme, genre, tempo, output_path, duration=None, ai_lyrics=False, voice_id=None):
     """Create MIDI file using chords2midi with enhanced features"""
@@ -85,9 +110,7 @@ def create_enhanced_midi(title, theme, genre, tempo, output_path, duration=None,
             "voice_id": voice_id
         }
         
-        metadata_path = output_path.replace('.mid', '_metadata.json')
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        write_metadata(metadata, output_path)
         
         print(f"Enhanced MIDI generated: {output_path}")
         return True
@@ -113,18 +136,26 @@ def create_basic_midi(title, theme, genre, tempo, output_path, duration=None):
         chords = generate_chord_progression(genre)
         time_per_chord = 480  # ticks
         
-        for i, chord_name in enumerate(chords):
+        # Build the note on/off messages once per distinct chord; bars that
+        # repeat a chord reuse the same (never mutated) message objects
+        chord_messages = {}
+        for chord_name in set(chords):
             # Simple chord mapping
             chord_notes = get_chord_notes(chord_name)
             
             # Note on
-            for note in chord_notes:
-                track.append(mido.Message('note_on', channel=0, note=note, velocity=64, time=0))
+            messages = [mido.Message('note_on', channel=0, note=note, velocity=64, time=0)
+                        for note in chord_notes]
             
             # Note off after duration
             for j, note in enumerate(chord_notes):
                 time = time_per_chord if j == 0 else 0
-                track.append(mido.Message('note_off', channel=0, note=note, velocity=64, time=time))
+                messages.append(mido.Message('note_off', channel=0, note=note, velocity=64, time=time))
+            
+            chord_messages[chord_name] = messages
+        
+        for chord_name in chords:
+            track.extend(chord_messages[chord_name])
         
         # Save MIDI file
         mid.save(output_path)
@@ -140,9 +171,7 @@ def create_basic_midi(title, theme, genre, tempo, output_path, duration=None):
             "chords": chords
         }
         
-        metadata_path = output_path.replace('.mid', '_metadata.json')
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        write_metadata(metadata, output_path)
         
         print(f"Basic MIDI generated: {output_path}")
         return True
@@ -151,28 +180,33 @@ def create_basic_midi(title, theme, genre, tempo, output_path, duration=None):
         print(f"Error generating basic MIDI: {e}")
         return False
 
+@lru_cache(maxsize=64)
 def get_chord_notes(chord_name):
-    """Map chord names to MIDI notes"""
-    base_notes = {
-        'C': 60, 'C#': 61, 'Db': 61, 'D': 62, 'D#': 63, 'Eb': 63,
-        'E': 64, 'F': 65, 'F#': 66, 'Gb': 66, 'G': 67, 'G#': 68,
-        'Ab': 68, 'A': 69, 'A#': 70, 'Bb': 70, 'B': 71
-    }
-    
+    """Map chord names to MIDI notes (memoized; returns an immutable tuple)"""
     # Extract root note
-    root = chord_name[0]
-    if len(chord_name) > 1 and chord_name[1] in ['#', 'b']:
-        root = chord_name[:2]
-    
-    base_note = base_notes.get(root, 60)
-    
-    # Major triad by default
-    if 'm' in chord_name.lower():
-        return [base_note, base_note + 3, base_note + 7]  # Minor
-    elif '7' in chord_name:
-        return [base_note, base_note + 4, base_note + 7, base_note + 10]  # Dominant 7
+    pitch_class = NATURAL_PITCH_CLASSES.get(chord_name[0])
+    quality = chord_name[1:]
+    if pitch_class is None:
+        base_note = MIDDLE_C
     else:
-        return [base_note, base_note + 4, base_note + 7]  # Major
+        offset = ACCIDENTAL_OFFSETS.get(quality[:1])
+        if offset is None:
+            offset = 0
+        else:
+            quality = quality[1:]
+        base_note = MIDDLE_C + pitch_class + offset
+    
+    # Unlisted qualities fall back to their family: minor for m-prefixed
+    # suffixes (Cm9, Cmin), dominant seventh for other 7ths, else major
+    intervals = CHORD_INTERVALS.get(quality)
+    if intervals is None:
+        if quality.startswith('m') and not quality.startswith('maj'):
+            intervals = CHORD_INTERVALS['m']
+        elif '7' in quality:
+            intervals = CHORD_INTERVALS['7']
+        else:
+            intervals = CHORD_INTERVALS['']
+    return tuple(base_note + interval for interval in intervals)
 
 def main():
     parser = argparse.ArgumentParser(description='Enhanced MIDI Generator for Burnt Beats')
@@ -9,6 +9,11 @@ import os
 import json
 import requests
 import hashlib
+from functools import lru_cache
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from datetime import datetime
 import logging
@@ -16,6 +21,46 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Style tokens recognised when deriving a pattern identifier from a filename
+PATTERN_STYLES = frozenset(['rock', 'funk', 'jazz', 'latin', 'blues', 'reggae', 'hiphop'])
+
+# Filename keywords for each pattern category, checked in order
+CATEGORY_KEYWORDS = (
+    ('funk', ('funk', 'soul')),
+    ('rock', ('rock', 'metal')),
+    ('jazz', ('jazz', 'swing')),
+    ('latin', ('latin', 'salsa', 'bossa')),
+    ('blues', ('blues', 'shuffle')),
+    ('reggae', ('reggae', 'ska')),
+    ('hiphop', ('hip', 'hop', 'rap')),
+)
+
+# Pattern IDs depend only on the filename, and the same names recur across
+# the local scan and both remote listings, so each is derived once
+@lru_cache(maxsize=None)
+def _pattern_id(filename):
+    """Create a pattern identifier from filename"""
+    # Remove common prefixes/suffixes and normalize
+    cleaned = filename.replace("groove_", "").replace(".mid", "")
+    
+    # Extract key components (tempo, style, type)
+    parts = cleaned.split("_")
+    if len(parts) >= 3:
+        # Try to find tempo and style
+        tempo = None
+        style = None
+        
+        for part in parts:
+            if part.isdigit() and 60 <= int(part) <= 250:
+                tempo = part
+            elif part in PATTERN_STYLES:
+                style = part
+        
+        if tempo and style:
+            return f"{style}_{tempo}"
+    
+    return hashlib.md5(cleaned.encode()).hexdigest()[:8]
+
 class RhythmFetcher:
     def __init__(self):
         self.base_url = "https://api.github.com/repos/Ocean82/midi_land"
@@ -24,6 +69,9 @@ class RhythmFetcher:
         self.templates_path = Path("storage/midi/templates")
         self.new_patterns_path = Path("storage/midi/new-patterns")
         
+        # One pooled HTTP session for every API and download request
+        self.session = self._create_session()
+        
         # Create directories
         self.new_patterns_path.mkdir(parents=True, exist_ok=True)
         
@@ -32,6 +80,15 @@ class RhythmFetcher:
         self.ocean82_patterns = []
         self.missing_patterns = []
         
+    def _create_session(self):
+        """Create a keep-alive HTTP session with retries on transient errors"""
+        session = requests.Session()
+        retries = Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
     def get_existing_patterns(self):
         """Get list of existing MIDI patterns"""
         logger.info("🔍 Scanning existing MIDI patterns...")
@@ -57,34 +114,21 @@ class RhythmFetcher:
         
     def _create_pattern_id(self, filename):
         """Create a pattern identifier from filename"""
-        # Remove common prefixes/suffixes and normalize
-        cleaned = filename.replace("groove_", "").replace(".mid", "")
-        
-        # Extract key components (tempo, style, type)
-        parts = cleaned.split("_")
-        if len(parts) >= 3:
-            # Try to find tempo and style
-            tempo = None
-            style = None
-            
-            for part in parts:
-                if part.isdigit() and 60 <= int(part) <= 250:
-                    tempo = part
-                elif part in ['rock', 'funk', 'jazz', 'latin', 'blues', 'reggae', 'hiphop']:
-                    style = part
-            
-            if tempo and style:
-                return f"{style}_{tempo}"
-        
-        return hashlib.md5(cleaned.encode()).hexdigest()[:8]
+        return _pattern_id(filename)
     
     def fetch_ocean82_patterns(self):
         """Fetch list of patterns from Ocean82 repository"""
         logger.info("🌊 Fetching Ocean82/midi_land patterns...")
         
         try:
+            # One recursive git tree request lists the whole repository;
+            # fall back to walking the contents API if it is truncated
+            if self._scan_repo_tree():
+                logger.info(f"Found {len(self.ocean82_patterns)} patterns in Ocean82 repository")
+                return
+            
             # Get repository contents
-            response = requests.get(f"{self.base_url}/contents")
+            response = self.session.get(f"{self.base_url}/contents", timeout=30)
             response.raise_for_status()
             
             contents = response.json()
@@ -97,6 +141,31 @@ class RhythmFetcher:
         except Exception as e:
             logger.error(f"Error fetching Ocean82 patterns: {e}")
     
+    def _scan_repo_tree(self):
+        """Collect MIDI patterns from the recursive git tree; False if unavailable"""
+        try:
+            response = self.session.get(f"{self.base_url}/git/trees/main?recursive=1", timeout=30)
+            response.raise_for_status()
+            tree = response.json()
+        except Exception as e:
+            logger.warning(f"Recursive tree listing failed, walking directories instead: {e}")
+            return False
+        
+        if tree.get('truncated'):
+            return False
+        
+        for item in tree.get('tree', []):
+            if item['type'] == 'blob' and item['path'].endswith('.mid'):
+                name = item['path'].rsplit('/', 1)[-1]
+                self.ocean82_patterns.append({
+                    'name': name,
+                    'path': item['path'],
+                    'download_url': f"{self.raw_base_url}/{quote(item['path'])}",
+                    'size': item.get('size', 0),
+                    'pattern_id': self._create_pattern_id(name)
+                })
+        return True
+    
     def _scan_repo_contents(self, contents, path_prefix):
         """Recursively scan repository contents for MIDI files"""
         for item in contents:
@@ -113,7 +182,7 @@ class RhythmFetcher:
             elif item['type'] == 'dir':
                 # Recursively scan subdirectories
                 try:
-                    subdir_response = requests.get(item['url'])
+                    subdir_response = self.session.get(item['url'], timeout=30)
                     subdir_response.raise_for_status()
                     subdir_contents = subdir_response.json()
                     
@@ -139,36 +208,46 @@ class RhythmFetcher:
             for pattern in self.missing_patterns[:10]:
                 logger.info(f"  - {pattern['name']} ({pattern['pattern_id']})")
     
-    def download_missing_patterns(self, limit=50):
+    def download_missing_patterns(self, limit=50, max_workers=4):
         """Download missing patterns with optional limit"""
         logger.info(f"⬇️  Downloading up to {limit} missing patterns...")
         
         downloaded = 0
         failed = 0
         
-        for pattern in self.missing_patterns[:limit]:
-            try:
-                # Download the file
-                response = requests.get(pattern['download_url'])
-                response.raise_for_status()
-                
-                # Save to new patterns directory
-                file_path = self.new_patterns_path / pattern['name']
-                with open(file_path, 'wb') as f:
-                    f.write(response.content)
-                
-                logger.info(f"✅ Downloaded: {pattern['name']}")
-                downloaded += 1
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to download {pattern['name']}: {e}")
-                failed += 1
+        # Downloads are independent and network-bound, so overlap them on
+        # a few threads sharing the session's connection pool
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._download_pattern, pattern): pattern
+                for pattern in self.missing_patterns[:limit]
+            }
+            for future in as_completed(futures):
+                pattern = futures[future]
+                try:
+                    future.result()
+                    logger.info(f"✅ Downloaded: {pattern['name']}")
+                    downloaded += 1
+                except Exception as e:
+                    logger.error(f"❌ Failed to download {pattern['name']}: {e}")
+                    failed += 1
         
         logger.info(f"📊 Download complete: {downloaded} successful, {failed} failed")
         
         # Generate report
         self._generate_report(downloaded, failed)
     
+    def _download_pattern(self, pattern):
+        """Download a single pattern into the new patterns directory"""
+        with self.session.get(pattern['download_url'], stream=True, timeout=30) as response:
+            response.raise_for_status()
+            
+            # Stream to the new patterns directory without buffering the body
+            file_path = self.new_patterns_path / pattern['name']
+            with open(file_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=65536):
+                    f.write(chunk)
+    
     def _generate_report(self, downloaded, failed):
         """Generate integration report"""
         report = {
@@ -236,22 +315,10 @@ class RhythmFetcher:
         """Determine category for a MIDI pattern based on filename"""
         filename_lower = filename.lower()
         
-        if any(style in filename_lower for style in ['funk', 'soul']):
-            return 'funk'
-        elif any(style in filename_lower for style in ['rock', 'metal']):
-            return 'rock'
-        elif any(style in filename_lower for style in ['jazz', 'swing']):
-            return 'jazz'
-        elif any(style in filename_lower for style in ['latin', 'salsa', 'bossa']):
-            return 'latin'
-        elif any(style in filename_lower for style in ['blues', 'shuffle']):
-            return 'blues'
-        elif any(style in filename_lower for style in ['reggae', 'ska']):
-            return 'reggae'
-        elif any(style in filename_lower for style in ['hip', 'hop', 'rap']):
-            return 'hiphop'
-        else:
-            return 'general'
+        for category, keywords in CATEGORY_KEYWORDS:
+            if any(style in filename_lower for style in keywords):
+                return category
+        return 'general'
 
 def main():
     import argparse
@@ -266,29 +333,32 @@ def main():
     
     fetcher = RhythmFetcher()
     
-    if args.all or args.scan:
-        fetcher.get_existing_patterns()
-        fetcher.fetch_ocean82_patterns()
-        fetcher.find_missing_patterns()
+    try:
+        if args.all or args.scan:
+            fetcher.get_existing_patterns()
+            fetcher.fetch_ocean82_patterns()
+            fetcher.find_missing_patterns()
         
-        if args.all or args.download:
-            limit = args.download if args.download else 50
-            fetcher.download_missing_patterns(limit)
+            if args.all or args.download:
+                limit = args.download if args.download else 50
+                fetcher.download_missing_patterns(limit)
             
-        if args.all or args.integrate:
-            fetcher.integrate_new_patterns()
+            if args.all or args.integrate:
+                fetcher.integrate_new_patterns()
     
-    elif args.download:
-        fetcher.get_existing_patterns()
-        fetcher.fetch_ocean82_patterns()
-        fetcher.find_missing_patterns()
-        fetcher.download_missing_patterns(args.download)
+        elif args.download:
+            fetcher.get_existing_patterns()
+            fetcher.fetch_ocean82_patterns()
+            fetcher.find_missing_patterns()
+            fetcher.download_missing_patterns(args.download)
     
-    elif args.integrate:
-        fetcher.integrate_new_patterns()
+        elif args.integrate:
+            fetcher.integrate_new_patterns()
     
-    else:
-        parser.print_help()
+        else:
+            parser.print_help()
+    finally:
+        fetcher.session.close()
 
 if __name__ == "__main__":
     main()
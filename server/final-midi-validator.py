@@ -42,16 +42,19 @@ class FinalMidiValidator:
             Path("storage/midi/groove-dataset")  # Include original dataset
         ]
         
-        midi_extensions = ['.mid', '.midi', '.MID', '.MIDI']
+        midi_extensions = {'.mid', '.midi', '.MID', '.MIDI'}
         
         for search_path in search_paths:
             if search_path.exists():
-                for ext in midi_extensions:
-                    for midi_file in search_path.rglob(f"*{ext}"):
-                        if midi_file.is_file() and midi_file.stat().st_size > 0:
-                            # Skip if it's already in an integrated directory
-                            if not any(exclude_dir in str(midi_file) for exclude_dir in exclude_dirs):
-                                self.system_midi_files.append(midi_file)
+                # One streaming walk per search path, filtering by suffix,
+                # instead of a full rglob traversal for every extension
+                for midi_file in search_path.rglob("*"):
+                    if midi_file.suffix not in midi_extensions:
+                        continue
+                    if midi_file.is_file() and midi_file.stat().st_size > 0:
+                        # Skip if it's already in an integrated directory
+                        if not any(exclude_dir in str(midi_file) for exclude_dir in exclude_dirs):
+                            self.system_midi_files.append(midi_file)
         
         self.validation_report['total_system_files'] = len(self.system_midi_files)
         logger.info(f"📊 Found {len(self.system_midi_files)} unintegrated MIDI files")
@@ -82,15 +85,14 @@ class FinalMidiValidator:
         self.scan_system_midi_files()
         self.scan_integrated_files()
         
+        # Integrated filenames joined once so each containment check is a
+        # single substring search rather than a Python loop over every file
+        integrated_names = "\n".join(f.name for f in self.integrated_files)
+        
         # Files that still need integration
         for midi_file in self.system_midi_files:
-            needs_integration = True
-            
             # Check if this file has already been integrated
-            for integrated_file in self.integrated_files:
-                if midi_file.stem in integrated_file.name:
-                    needs_integration = False
-                    break
+            needs_integration = midi_file.stem not in integrated_names
             
             if needs_integration:
                 self.missing_files.append({
@@ -11,6 +11,7 @@ Renames all MIDI files to be Windows-compatible by:
 
 import os
 import re
+import json
 from pathlib import Path
 import logging
 
@@ -69,12 +70,13 @@ class MidiFilenamesFixer:
             
         logger.info(f"Processing directory: {directory}")
         
-        # Find all MIDI files recursively
-        midi_extensions = ['.mid', '.midi', '.MID', '.MIDI']
-        midi_files = []
-        
-        for ext in midi_extensions:
-            midi_files.extend(directory.rglob(f"*{ext}"))
+        # Find all MIDI files recursively in one walk. The matches are
+        # collected up front because the loop below renames files in place.
+        midi_extensions = {'.mid', '.midi', '.MID', '.MIDI'}
+        midi_files = [
+            path for path in directory.rglob("*")
+            if path.suffix in midi_extensions
+        ]
         
         logger.info(f"Found {len(midi_files)} MIDI files in {directory}")
         
@@ -113,6 +115,9 @@ class MidiFilenamesFixer:
 
     def update_catalog_files(self):
         """Update catalog files with new filenames"""
+        if not self.renamed_files:
+            return
+        
         catalog_files = [
             Path("storage/midi/groove/metadata/groove_catalog.json"),
             Path("storage/midi/templates/chord-sets/chord_sets_catalog.json"),
@@ -122,24 +127,23 @@ class MidiFilenamesFixer:
         for catalog_file in catalog_files:
             if catalog_file.exists():
                 try:
-                    import json
                     with open(catalog_file, 'r') as f:
                         data = json.load(f)
                     
-                    # Update the catalog with new filenames
+                    # Update the catalog with new filenames: serialize once,
+                    # apply every rename to the text, then parse and write once
+                    data_str = json.dumps(data)
                     updated = False
                     for renamed in self.renamed_files:
                         old_name = renamed['original_name']
                         new_name = renamed['new_name']
                         
-                        # Convert to string and replace occurrences
-                        data_str = json.dumps(data)
                         if old_name in data_str:
                             data_str = data_str.replace(old_name, new_name)
-                            data = json.loads(data_str)
                             updated = True
                     
                     if updated:
+                        data = json.loads(data_str)
                         with open(catalog_file, 'w') as f:
                             json.dump(data, f, indent=2)
                         logger.info(f"Updated catalog: {catalog_file}")
@@ -159,7 +163,6 @@ class MidiFilenamesFixer:
         report_path = Path("storage/midi/filename_fix_report.json")
         report_path.parent.mkdir(parents=True, exist_ok=True)
         
-        import json
         with open(report_path, 'w') as f:
             json.dump(report, f, indent=2)
         
@@ -6,17 +6,85 @@ Integrates the Groove v1.0.0 MIDI dataset
 """
 
 import os
+import re
 import sys
 import json
 import mido
+import sqlite3
+import tempfile
 from pathlib import Path
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 import shutil
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from json_utils import dumps, loads, write_json
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Style detection keywords, checked in priority order against the filename
+# and parent directory; one precompiled alternation per style
+STYLE_KEYWORDS = {
+    'rock': ['rock', 'punk', 'metal', 'grunge'],
+    'jazz': ['jazz', 'swing', 'bebop', 'fusion'],
+    'funk': ['funk', 'soul', 'r&b', 'rnb'],
+    'latin': ['latin', 'salsa', 'bossa', 'samba', 'mambo'],
+    'electronic': ['electronic', 'edm', 'techno', 'house', 'trance'],
+    'hip_hop': ['hip', 'hop', 'rap', 'trap', 'drill'],
+    'pop': ['pop', 'commercial', 'mainstream'],
+    'blues': ['blues', 'shuffle'],
+    'reggae': ['reggae', 'ska', 'dub'],
+    'country': ['country', 'folk', 'bluegrass'],
+    'world': ['world', 'ethnic', 'traditional']
+}
+STYLE_PATTERNS = [
+    (style, re.compile('|'.join(map(re.escape, keywords))))
+    for style, keywords in STYLE_KEYWORDS.items()
+]
+GROOVE_EXTENSIONS = frozenset(['.mid', '.midi', '.MID', '.MIDI'])
+COPY_CHUNK_SIZE = 1 << 20
+
+
+def _fast_copy(source_path: Path, target_path: Path):
+    """Copy a file in-kernel where possible, then carry over mode and mtime"""
+    # Copy into a private temp file and rename it over the target, so
+    # concurrent copies of same-named grooves never interleave their writes
+    fd, tmp_path = tempfile.mkstemp(dir=target_path.parent, suffix='.part')
+    try:
+        # Wrap the raw fd first so it is closed even if the source fails to open
+        with open(fd, 'wb') as dst, open(source_path, 'rb') as src:
+            _copy_contents(src, dst)
+        shutil.copystat(source_path, tmp_path)
+        os.replace(tmp_path, target_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _copy_contents(src, dst):
+    """Copy between open files with copy_file_range/sendfile, else buffered reads"""
+    remaining = os.fstat(src.fileno()).st_size
+    try:
+        # copy_file_range can reflink or copy server-side; sendfile still
+        # avoids the userspace round trip on older kernels
+        copy = getattr(os, 'copy_file_range', None) or (
+            lambda fd_in, fd_out, count: os.sendfile(fd_out, fd_in, None, count)
+        )
+        while remaining > 0:
+            copied = copy(src.fileno(), dst.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+    except OSError:
+        # Not supported for this filesystem pair; restart with plain reads
+        src.seek(0)
+        dst.seek(0)
+        dst.truncate()
+        shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+
+
 class GrooveDatasetLoader:
     """Loader for Groove v1.0.0 MIDI dataset integration"""
     
@@ -24,6 +92,7 @@ class GrooveDatasetLoader:
         self.dataset_path = Path(dataset_path)
         self.storage_path = Path("storage/midi/groove")
         self.templates_path = Path("storage/midi/templates")
+        self.index_path = self.storage_path / "metadata" / "groove_index.sqlite"
         
         # Setup directories
         self._setup_directories()
@@ -63,9 +132,6 @@ class GrooveDatasetLoader:
         }
         
         try:
-            # Look for extracted groove files
-            groove_files = []
-            
             # Search for MIDI files in various subdirectories and the entire system
             search_locations = [
                 self.dataset_path,
@@ -74,52 +140,29 @@ class GrooveDatasetLoader:
                 Path("assets"),
                 Path("storage/midi/groove-dataset")
             ]
+            styles = defaultdict(list)
+            groove_patterns = defaultdict(list)
             
-            for location in search_locations:
-                if location.exists():
-                    for pattern in ['**/*.mid', '**/*.midi', '**/*.MID', '**/*.MIDI']:
-                        groove_files.extend(list(location.glob(pattern)))
-            
+            # Executor.map() submits every file up front, so collect the
+            # list first and report the count before processing starts
+            groove_files = list(self._iter_groove_files(search_locations))
             logger.info(f"Found {len(groove_files)} MIDI files in groove dataset")
             
-            for midi_file in groove_files:
-                try:
-                    # Analyze the MIDI file
-                    analysis = self._analyze_groove_midi(midi_file)
-                    
-                    # Categorize by style/genre
-                    style = self._detect_groove_style(midi_file, analysis)
-                    
-                    # Copy to organized storage
-                    target_path = self._organize_groove_file(midi_file, style)
-                    
-                    # Store results
-                    file_info = {
-                        'original_path': str(midi_file),
-                        'storage_path': str(target_path),
-                        'style': style,
-                        'analysis': analysis,
-                        'tempo': analysis.get('estimated_tempo', 120),
-                        'time_signature': analysis.get('time_signature', '4/4'),
-                        'groove_type': self._classify_groove_type(analysis)
-                    }
+            # Analysis and copying are independent per file, so run them
+            # concurrently; map() keeps results in discovery order
+            with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+                for file_info in executor.map(self._process_groove_file, groove_files):
+                    if file_info is None:
+                        continue
                     
                     results['extracted_files'].append(file_info)
                     
-                    # Group by style
-                    if style not in results['styles']:
-                        results['styles'][style] = []
-                    results['styles'][style].append(file_info)
-                    
-                    # Group by groove pattern type
-                    groove_type = file_info['groove_type']
-                    if groove_type not in results['groove_patterns']:
-                        results['groove_patterns'][groove_type] = []
-                    results['groove_patterns'][groove_type].append(file_info)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing {midi_file}: {e}")
-                    continue
+                    # Group by style and by groove pattern type
+                    styles[file_info['style']].append(file_info)
+                    groove_patterns[file_info['groove_type']].append(file_info)
+            
+            results['styles'] = dict(styles)
+            results['groove_patterns'] = dict(groove_patterns)
             
             results['integration_status'] = 'success'
             results['total_files'] = len(results['extracted_files'])
@@ -139,6 +182,40 @@ class GrooveDatasetLoader:
         
         return results
     
+    def _iter_groove_files(self, search_locations: List[Path]) -> Iterator[Path]:
+        """Yield MIDI files under each location from a single walk per location"""
+        for location in search_locations:
+            if location.exists():
+                for path in location.rglob("*"):
+                    if path.suffix in GROOVE_EXTENSIONS:
+                        yield path
+    
+    def _process_groove_file(self, midi_file: Path) -> Optional[Dict]:
+        """Analyze, classify and store one groove file"""
+        try:
+            # Analyze the MIDI file
+            analysis = self._analyze_groove_midi(midi_file)
+            
+            # Categorize by style/genre
+            style = self._detect_groove_style(midi_file, analysis)
+            
+            # Copy to organized storage
+            target_path = self._organize_groove_file(midi_file, style)
+            
+            return {
+                'original_path': str(midi_file),
+                'storage_path': str(target_path),
+                'style': style,
+                'analysis': analysis,
+                'tempo': analysis.get('estimated_tempo', 120),
+                'time_signature': analysis.get('time_signature', '4/4'),
+                'groove_type': self._classify_groove_type(analysis)
+            }
+            
+        except Exception as e:
+            logger.error(f"Error processing {midi_file}: {e}")
+            return None
+    
     def _analyze_groove_midi(self, midi_path: Path) -> Dict:
         """Analyze a groove MIDI file"""
         try:
@@ -211,30 +288,15 @@ class GrooveDatasetLoader:
         filename = midi_path.name.lower()
         parent_dir = midi_path.parent.name.lower()
         
-        # Style detection based on filename and directory
-        style_keywords = {
-            'rock': ['rock', 'punk', 'metal', 'grunge'],
-            'jazz': ['jazz', 'swing', 'bebop', 'fusion'],
-            'funk': ['funk', 'soul', 'r&b', 'rnb'],
-            'latin': ['latin', 'salsa', 'bossa', 'samba', 'mambo'],
-            'electronic': ['electronic', 'edm', 'techno', 'house', 'trance'],
-            'hip_hop': ['hip', 'hop', 'rap', 'trap', 'drill'],
-            'pop': ['pop', 'commercial', 'mainstream'],
-            'blues': ['blues', 'shuffle'],
-            'reggae': ['reggae', 'ska', 'dub'],
-            'country': ['country', 'folk', 'bluegrass'],
-            'world': ['world', 'ethnic', 'traditional']
-        }
-        
-        # Check tempo-based classification
-        tempo = analysis.get('estimated_tempo', 120)
-        
-        for style, keywords in style_keywords.items():
-            for keyword in keywords:
-                if keyword in filename or keyword in parent_dir:
-                    return style
+        # Style detection based on filename and directory ('/' cannot occur
+        # in either name, so no keyword can match across the join)
+        haystack = f"{filename}/{parent_dir}"
+        for style, pattern in STYLE_PATTERNS:
+            if pattern.search(haystack):
+                return style
         
         # Tempo-based fallback classification
+        tempo = analysis.get('estimated_tempo', 120)
         if tempo < 80:
             return 'ballad'
         elif tempo < 100:
@@ -264,18 +326,69 @@ class GrooveDatasetLoader:
         
         # Copy file
         target_path = style_dir / source_path.name
-        shutil.copy2(source_path, target_path)
+        _fast_copy(source_path, target_path)
         
         return target_path
     
     def _save_groove_catalog(self, results: Dict):
         """Save the groove catalog to JSON"""
         catalog_path = self.storage_path / "metadata" / "groove_catalog.json"
-        
-        with open(catalog_path, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        write_json(results, catalog_path, default=str)
         
         logger.info(f"Groove catalog saved to {catalog_path}")
+        
+        # The JSON catalog is authoritative; a failed index build is logged
+        # and the stale index removed, so lookups fall back to the catalog
+        # until the next successful run
+        try:
+            self._save_groove_index(results)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to build groove index {self.index_path}: {e}")
+            self.index_path.unlink(missing_ok=True)
+    
+    def _save_groove_index(self, results: Dict):
+        """Index the cataloged grooves by style and tempo in SQLite"""
+        # dumps() always returns str, so the data column holds TEXT rather
+        # than the BLOB sqlite3 would store for bytes
+        rows = [
+            (groove['style'], groove['tempo'], dumps(groove, default=str))
+            for groove in results['extracted_files']
+        ]
+        
+        conn = sqlite3.connect(self.index_path)
+        try:
+            with conn:
+                conn.execute("DROP TABLE IF EXISTS grooves")
+                conn.execute(
+                    "CREATE TABLE grooves ("
+                    "id INTEGER PRIMARY KEY, style TEXT, tempo REAL, data TEXT)"
+                )
+                conn.execute("CREATE INDEX idx_style ON grooves(style)")
+                conn.execute("CREATE INDEX idx_tempo ON grooves(tempo)")
+                conn.executemany(
+                    "INSERT INTO grooves (style, tempo, data) VALUES (?, ?, ?)", rows
+                )
+        finally:
+            conn.close()
+        
+        logger.info(f"Groove index saved to {self.index_path}")
+    
+    def _query_groove_index(self, where: str, params: tuple) -> Optional[List[Dict]]:
+        """Run an indexed lookup, or return None if no index has been built"""
+        if not self.index_path.exists():
+            return None
+        
+        conn = sqlite3.connect(self.index_path)
+        try:
+            cursor = conn.execute(
+                f"SELECT data FROM grooves WHERE {where} ORDER BY id", params
+            )
+            return [loads(data) for (data,) in cursor]
+        except sqlite3.Error as e:
+            logger.warning(f"Groove index unavailable, falling back to catalog: {e}")
+            return None
+        finally:
+            conn.close()
     
     def _copy_featured_grooves_to_templates(self, results: Dict):
         """Copy the best grooves to main templates directory"""
@@ -313,7 +426,7 @@ class GrooveDatasetLoader:
                 new_name = f"groove_{style}_{tempo}bpm_{groove_type}_{source_path.stem}.mid"
                 target_path = self.templates_path / new_name
                 
-                shutil.copy2(source_path, target_path)
+                _fast_copy(source_path, target_path)
                 featured_count += 1
                 logger.info(f"Added featured groove: {new_name}")
         
@@ -321,6 +434,10 @@ class GrooveDatasetLoader:
     
     def get_grooves_by_style(self, style: str) -> List[Dict]:
         """Get all grooves of a specific style"""
+        grooves = self._query_groove_index("style = ?", (style,))
+        if grooves is not None:
+            return grooves
+        
         catalog_path = self.storage_path / "metadata" / "groove_catalog.json"
         
         if not catalog_path.exists():
@@ -337,6 +454,10 @@ class GrooveDatasetLoader:
     
     def get_grooves_by_tempo_range(self, min_tempo: int, max_tempo: int) -> List[Dict]:
         """Get grooves within a tempo range"""
+        grooves = self._query_groove_index("tempo BETWEEN ? AND ?", (min_tempo, max_tempo))
+        if grooves is not None:
+            return grooves
+        
         catalog_path = self.storage_path / "metadata" / "groove_catalog.json"
         
         if not catalog_path.exists():
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Shared JSON helpers for the Burnt Beats server scripts
+Uses orjson when it is installed and falls back to the json module
+"""
+
+import json
+import os
+import tempfile
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def loads(data):
+    """Parse JSON from str or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj, default=None) -> str:
+    """Serialize obj to a compact JSON string"""
+    if orjson is not None:
+        # orjson emits UTF-8 bytes; decode so callers always get text
+        return orjson.dumps(obj, default=default).decode()
+    return json.dumps(obj, default=default)
+
+def read_json(path):
+    """Parse a JSON file"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+def write_json(data, path, default=None):
+    """Write indented JSON to path"""
+    # Write a temp file and rename it over path, so readers never see a
+    # partial file and every rewrite also bumps the directory's mtime
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with open(fd, 'wb' if orjson is not None else 'w') as f:
+            # mkstemp creates the file 0600; give it the usual rw-r--r--
+            os.fchmod(f.fileno(), 0o644)
+            if orjson is not None:
+                f.write(orjson.dumps(data, default=default, option=orjson.OPT_INDENT_2))
+            else:
+                json.dump(data, f, indent=2, default=default)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
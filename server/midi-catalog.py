@@ -15,6 +15,8 @@ class MidiCatalog:
     def __init__(self, templates_dir="./storage/midi/templates"):
         self.templates_dir = Path(templates_dir)
         self.catalog_file = self.templates_dir / "midi_catalog.json"
+        self._catalog_cache = None
+        self._catalog_mtime = None
         
     def analyze_midi_file(self, midi_path):
         """Analyze a MIDI file and extract metadata"""
@@ -137,11 +139,19 @@ class MidiCatalog:
         print(f"💾 Catalog saved to: {self.catalog_file}")
     
     def load_catalog(self):
-        """Load existing catalog"""
-        if self.catalog_file.exists():
+        """Load existing catalog, reusing the parsed copy until the file changes"""
+        # A single stat doubles as the existence check and the cache key
+        try:
+            mtime = os.stat(self.catalog_file).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        
+        if self._catalog_cache is None or mtime != self._catalog_mtime:
             with open(self.catalog_file, 'r') as f:
-                return json.load(f)
-        return None
+                self._catalog_cache = json.load(f)
+            self._catalog_mtime = mtime
+        
+        return self._catalog_cache
     
     def get_template_suggestions(self, genre=None, tempo_range=None):
         """Get template suggestions based on criteria"""
@@ -6,15 +6,20 @@ Imports and processes advanced rhythm files from Ocean82/midi_land repository
 """
 
 import os
-import json
 import mido
 import requests
 import shutil
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from datetime import datetime
 import argparse
 import logging
 
+from json_utils import loads, write_json
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -30,6 +35,9 @@ class MidiLandImporter:
         self.github_api_base = "https://api.github.com/repos/Ocean82/midi_land"
         self.github_raw_base = "https://raw.githubusercontent.com/Ocean82/midi_land/main"
         
+        # One pooled HTTP session for every API and download request
+        self.session = self._create_session()
+        
         # Setup directories
         self._setup_directories()
         
@@ -41,6 +49,15 @@ class MidiLandImporter:
             'errors': []
         }
 
+    def _create_session(self):
+        """Create a keep-alive HTTP session with retries on transient errors"""
+        session = requests.Session()
+        retries = Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
     def _setup_directories(self):
         """Setup directory structure for rhythm patterns"""
         directories = [
@@ -63,11 +80,19 @@ class MidiLandImporter:
         try:
             logger.info("🔍 Fetching repository contents from Ocean82/midi_land...")
             
+            # One recursive git tree request lists the whole repository;
+            # fall back to walking the contents API per directory if the
+            # tree is unavailable or truncated
+            midi_files = self._fetch_tree_midi_files()
+            if midi_files is not None:
+                logger.info(f"📊 Found {len(midi_files)} MIDI files in repository")
+                return midi_files
+            
             # Get repository structure
-            response = requests.get(f"{self.github_api_base}/contents", timeout=30)
+            response = self.session.get(f"{self.github_api_base}/contents", timeout=30)
             
             if response.status_code == 200:
-                contents = response.json()
+                contents = loads(response.content)
                 midi_files = []
                 
                 for item in contents:
@@ -89,13 +114,40 @@ class MidiLandImporter:
             self.import_report['errors'].append(f"Repository fetch error: {e}")
             return []
 
+    def _fetch_tree_midi_files(self):
+        """List MIDI files via the recursive git trees API, or None on failure"""
+        try:
+            response = self.session.get(f"{self.github_api_base}/git/trees/main?recursive=1", timeout=30)
+            if response.status_code != 200:
+                return None
+            
+            tree = loads(response.content)
+            if tree.get('truncated'):
+                return None
+            
+            # Shape entries like contents API items for the download path
+            return [
+                {
+                    'name': item['path'].rsplit('/', 1)[-1],
+                    'path': item['path'],
+                    'download_url': f"{self.github_raw_base}/{quote(item['path'])}",
+                    'size': item.get('size', 0),
+                    'type': 'file'
+                }
+                for item in tree.get('tree', [])
+                if item['type'] == 'blob' and item['path'].lower().endswith(('.mid', '.midi'))
+            ]
+        except Exception as e:
+            logger.warning(f"Recursive tree listing failed, walking directories instead: {e}")
+            return None
+
     def _fetch_directory_contents(self, dir_path):
         """Recursively fetch MIDI files from subdirectories"""
         try:
-            response = requests.get(f"{self.github_api_base}/contents/{dir_path}", timeout=30)
+            response = self.session.get(f"{self.github_api_base}/contents/{dir_path}", timeout=30)
             
             if response.status_code == 200:
-                contents = response.json()
+                contents = loads(response.content)
                 midi_files = []
                 
                 for item in contents:
@@ -122,38 +174,41 @@ class MidiLandImporter:
             
             logger.info(f"⬇️  Downloading {file_name}...")
             
-            response = requests.get(download_url, timeout=30)
-            
-            if response.status_code == 200:
+            with self.session.get(download_url, stream=True, timeout=30) as response:
+                if response.status_code != 200:
+                    logger.error(f"Failed to download {file_name}: {response.status_code}")
+                    return None
+                
                 # Determine category based on file path or name
                 category = self._categorize_rhythm_file(file_info)
                 category_path = self.midi_land_path / category
                 
                 file_path = category_path / file_name
                 
+                # Stream the body to disk, counting bytes as they arrive
+                size = 0
                 with open(file_path, 'wb') as f:
-                    f.write(response.content)
-                
-                # Analyze the MIDI file
-                analysis = self._analyze_rhythm_file(file_path)
-                
-                file_record = {
-                    'filename': file_name,
-                    'original_path': file_info['path'],
-                    'local_path': str(file_path),
-                    'category': category,
-                    'size': len(response.content),
-                    'analysis': analysis,
-                    'downloaded_at': datetime.now().isoformat()
-                }
-                
-                self.import_report['imported_files'].append(file_record)
-                logger.info(f"✅ Successfully imported {file_name} -> {category}")
-                
-                return file_record
-            else:
-                logger.error(f"Failed to download {file_name}: {response.status_code}")
-                return None
+                    for chunk in response.iter_content(chunk_size=65536):
+                        f.write(chunk)
+                        size += len(chunk)
+            
+            # Analyze the MIDI file
+            analysis = self._analyze_rhythm_file(file_path)
+            
+            file_record = {
+                'filename': file_name,
+                'original_path': file_info['path'],
+                'local_path': str(file_path),
+                'category': category,
+                'size': size,
+                'analysis': analysis,
+                'downloaded_at': datetime.now().isoformat()
+            }
+            
+            self.import_report['imported_files'].append(file_record)
+            logger.info(f"✅ Successfully imported {file_name} -> {category}")
+            
+            return file_record
                 
         except Exception as e:
             logger.error(f"Error downloading {file_info['name']}: {e}")
@@ -264,13 +319,31 @@ class MidiLandImporter:
             logger.error("No MIDI files found or could not access repository")
             return
         
-        # Download and process each file
+        # Files from different source directories can share a basename and
+        # category, i.e. the same local target; keep the first so no two
+        # concurrent downloads write the same file
+        targets = set()
+        unique_files = []
         for file_info in midi_files:
-            try:
-                self.download_midi_file(file_info)
-            except Exception as e:
-                logger.error(f"Error processing {file_info['name']}: {e}")
+            target = (self._categorize_rhythm_file(file_info), file_info['name'])
+            if target in targets:
+                logger.warning(f"Skipping {file_info['path']}: {target[0]}/{target[1]} is already being imported")
                 continue
+            targets.add(target)
+            unique_files.append(file_info)
+        midi_files = unique_files
+        
+        # Download and process files concurrently; each download is
+        # network-bound and independent of the others
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [(file_info, executor.submit(self.download_midi_file, file_info))
+                       for file_info in midi_files]
+            for file_info, future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Error processing {file_info['name']}: {e}")
+                    continue
         
         # Generate catalog
         self._generate_rhythm_catalog()
@@ -332,14 +405,13 @@ class MidiLandImporter:
         
         # Save catalog
         catalog_path = self.midi_land_path / "rhythm_catalog.json"
-        with open(catalog_path, 'w') as f:
-            json.dump(catalog, f, indent=2)
+        write_json(catalog, catalog_path)
         
         logger.info(f"📊 Catalog saved: {catalog_path}")
 
     def _get_tempo_range(self, bpm):
         """Get tempo range category"""
-        if bmp < 80:
+        if bpm < 80:
             return 'slow'
         elif bpm < 120:
             return 'medium'
@@ -352,25 +424,27 @@ class MidiLandImporter:
         """Save import report"""
         report_path = self.midi_land_path / "import_report.json"
         
-        with open(report_path, 'w') as f:
-            json.dump(self.import_report, f, indent=2)
+        write_json(self.import_report, report_path)
         
         logger.info(f"📋 Import report saved: {report_path}")
 
 def main():
     parser = argparse.ArgumentParser(description='Import Ocean82/midi_land rhythm files')
-    parser.add_argument('--import', action='store_true', help='Import all files from repository')
+    parser.add_argument('--import', dest='import_all', action='store_true', help='Import all files from repository')
     parser.add_argument('--catalog-only', action='store_true', help='Generate catalog from existing files')
     
     args = parser.parse_args()
     
     importer = MidiLandImporter()
     
-    if args.import or not any([args.catalog_only]):
-        # Default action is to import
-        importer.import_all_files()
-    elif args.catalog_only:
-        importer._generate_rhythm_catalog()
+    try:
+        if args.import_all or not any([args.catalog_only]):
+            # Default action is to import
+            importer.import_all_files()
+        elif args.catalog_only:
+            importer._generate_rhythm_catalog()
+    finally:
+        importer.session.close()
 
 if __name__ == "__main__":
     main()
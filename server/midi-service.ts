@@ -24,6 +24,9 @@ export interface MidiGenerationResult {
   error?: string;         // Error message if failed
 }
 
+// Maximum characters of child-process stderr kept for error reporting
+const MAX_STDERR_TAIL = 16 * 1024;
+
 // MIDI SERVICE CLASS
 // NOTE: Handles all MIDI generation and template management
 // TODO: Add caching mechanism for frequently used templates
@@ -105,16 +108,19 @@ class MidiService {
 
   private async executePythonScript(args: string[]): Promise<{ success: boolean; error?: string }> {
     return new Promise((resolve) => {
-      const childProcess = spawn(this.pythonPath, args);
-      let stderr = '';
-      let stdout = '';
-
-      childProcess.stdout.on('data', (data) => {
-        stdout += data.toString();
+      // STDIO HANDLING
+      // NOTE: Nothing reads the scripts' stdout, so it is discarded at the
+      // OS level; stderr keeps only a bounded tail for the error message
+      const childProcess = spawn(this.pythonPath, args, {
+        stdio: ['ignore', 'ignore', 'pipe']
       });
+      let stderr = '';
 
       childProcess.stderr.on('data', (data) => {
         stderr += data.toString();
+        if (stderr.length > MAX_STDERR_TAIL) {
+          stderr = stderr.slice(-MAX_STDERR_TAIL);
+        }
       });
 
       childProcess.on('close', (code) => {
@@ -278,7 +284,8 @@ class MidiService {
       ]);
 
       if (result.success) {
-        // Parse the JSON output from the Python script
+        // The script only prints a human-readable listing and its stdout is
+        // discarded, so there are no structured results to return yet
         return [];
       } else {
         return [];
@@ -417,7 +424,8 @@ class MidiService {
       const result = await this.executePythonScript(args);
 
       if (result.success) {
-        // Parse the JSON output from the Python script
+        // The script only prints a human-readable listing and its stdout is
+        // discarded, so there are no structured results to return yet
         return [];
       } else {
         return [];
@@ -5,13 +5,18 @@ MIDI Validation and Processing Script for Burnt Beats
 Ensures all MIDI files are properly processed and ready to function
 """
 
-import os
+import sys
 import json
+import subprocess
 import mido
 from pathlib import Path
 import argparse
 from typing import Dict, List, Any
 
+# Per-script timeouts (seconds) for catalog regeneration subprocesses
+CATALOG_SCAN_TIMEOUT = 300
+GROOVE_EXTRACT_TIMEOUT = 1800
+
 class MidiValidator:
     def __init__(self):
         self.midi_base = Path("./storage/midi")
@@ -207,7 +212,8 @@ class MidiValidator:
         # Import and run catalog generators
         try:
             # Run MIDI catalog
-            os.system("python3 server/midi-catalog.py --scan")
+            subprocess.run([sys.executable, "server/midi-catalog.py", "--scan"],
+                           check=True, timeout=CATALOG_SCAN_TIMEOUT)
             print("   ✅ MIDI template catalog updated")
         except Exception as e:
             print(f"   ❌ Error updating MIDI catalog: {e}")
@@ -215,7 +221,8 @@ class MidiValidator:
         try:
             # Run groove dataset catalog if needed
             if self.groove_dir.exists():
-                os.system("python3 server/groove-dataset-loader.py --extract")
+                subprocess.run([sys.executable, "server/groove-dataset-loader.py", "--extract"],
+                               check=True, timeout=GROOVE_EXTRACT_TIMEOUT)
                 print("   ✅ Groove dataset catalog updated")
         except Exception as e:
             print(f"   ❌ Error updating groove catalog: {e}")
@@ -7,12 +7,33 @@ Manages model paths and downloads for various AI services
 
 import os
 import json
-from pathlib import Path
+import random
+import time
 from typing import Dict, Any
+import http.client
+import urllib.error
 import urllib.request
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+# HTTP statuses worth retrying; any other HTTP error is treated as permanent
+TRANSIENT_HTTP_STATUSES = {408, 429, 500, 502, 503, 504}
+
+# Network failures worth retrying. URLError covers DNS/connection failures
+# and ContentTooShortError; local OSErrors (disk full, permissions on the
+# .part file, a failed os.replace) are permanent and fail fast.
+TRANSIENT_DOWNLOAD_ERRORS = (
+    urllib.error.URLError,
+    TimeoutError,
+    ConnectionError,
+    http.client.IncompleteRead,
+)
 
 class ModelManager:
+    max_download_attempts = 4
+    retry_base_delay = 2.0  # seconds
+    retry_max_delay = 60.0  # seconds
+    
     def __init__(self):
         self.config = self.load_config()
         self.ensure_directories()
@@ -64,8 +85,12 @@ class ModelManager:
         # Add music directories
         directories.extend(self.config['music'].values())
         
-        for directory in directories:
-            Path(directory).mkdir(parents=True, exist_ok=True)
+        # Several entries share parents or repeat when env overrides point
+        # at the same place; stat each distinct path once and only create
+        # the ones that are actually missing
+        for directory in dict.fromkeys(directories):
+            if not os.path.isdir(directory):
+                os.makedirs(directory, exist_ok=True)
             print(f"📁 Ensured directory exists: {directory}")
     
     def get_model_path(self, category: str, model_name: str = None) -> str:
@@ -106,14 +131,46 @@ class ModelManager:
             return True
         
         try:
-            print(f"📥 Downloading {model_key} from {url}")
             os.makedirs(os.path.dirname(target_path), exist_ok=True)
-            urllib.request.urlretrieve(url, target_path)
-            print(f"✅ Downloaded {model_key} to {target_path}")
-            return True
-        except Exception as e:
+        except OSError as e:
             print(f"❌ Failed to download {model_key}: {e}")
             return False
+        
+        # Download to a side file so a failed attempt never leaves a
+        # truncated model behind that the exists() check would accept
+        partial_path = f"{target_path}.part"
+        
+        for attempt in range(1, self.max_download_attempts + 1):
+            try:
+                print(f"📥 Downloading {model_key} from {url}")
+                urllib.request.urlretrieve(url, partial_path)
+                os.replace(partial_path, target_path)
+                print(f"✅ Downloaded {model_key} to {target_path}")
+                return True
+            except Exception as e:
+                try:
+                    os.remove(partial_path)
+                except OSError:
+                    pass
+                
+                if not self._is_transient_error(e) or attempt == self.max_download_attempts:
+                    print(f"❌ Failed to download {model_key}: {e}")
+                    return False
+                
+                # Exponential backoff with jitter
+                delay = min(self.retry_base_delay * (2 ** (attempt - 1)), self.retry_max_delay)
+                delay += random.uniform(0, delay * 0.1)
+                print(f"⚠️  Download attempt {attempt} for {model_key} failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+        
+        return False
+    
+    def _is_transient_error(self, error: Exception) -> bool:
+        """Whether a download error is worth retrying"""
+        if isinstance(error, urllib.error.HTTPError):
+            return error.code in TRANSIENT_HTTP_STATUSES
+        # Bad URLs surface as ValueError and fail fast
+        return isinstance(error, TRANSIENT_DOWNLOAD_ERRORS)
     
     def verify_model(self, model_path: str, expected_hash: str = None) -> bool:
         """Verify model integrity"""
@@ -121,8 +178,10 @@ class ModelManager:
             return False
         
         if expected_hash:
+            # file_digest streams the file through the hasher in large
+            # blocks instead of reading a multi-GB model into memory first
             with open(model_path, 'rb') as f:
-                file_hash = hashlib.md5(f.read()).hexdigest()
+                file_hash = hashlib.file_digest(f, 'md5').hexdigest()
             return file_hash == expected_hash
         
         # Basic size check (models should be > 1MB)
@@ -166,10 +225,17 @@ class ModelManager:
         }
         
         for model_name, model_path in key_models.items():
+            # One stat answers both existence and size
+            try:
+                size_bytes = os.stat(model_path).st_size
+                exists = True
+            except OSError:
+                size_bytes = 0
+                exists = False
             status['models'][model_name] = {
-                'exists': os.path.exists(model_path),
+                'exists': exists,
                 'path': model_path,
-                'size_mb': round(os.path.getsize(model_path) / (1024*1024), 2) if os.path.exists(model_path) else 0
+                'size_mb': round(size_bytes / (1024*1024), 2)
             }
         
         return status
@@ -185,8 +251,10 @@ def main():
     # Download essential models if auto-download is enabled
     if manager.config['processing']['auto_download']:
         print("\n📥 Auto-downloading essential models...")
-        manager.download_model('hubert_base')
-        manager.download_model('rmvpe')
+        # The models are independent, so fetch them side by side
+        essential_models = ['hubert_base', 'rmvpe']
+        with ThreadPoolExecutor(max_workers=len(essential_models)) as executor:
+            list(executor.map(manager.download_model, essential_models))
     
     # Show status
     status = manager.get_status()
@@ -14,15 +14,47 @@ import subprocess
 import librosa
 import soundfile as sf
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import tempfile
 import logging
 
+from audio_utils import load_audio, peak_normalize
+from json_utils import read_json, write_json
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# One second of 16 kHz float32 silence, shared by every TTS fallback write
+_SILENCE = np.zeros(16000, dtype=np.float32)
+_SILENCE.flags.writeable = False
+
+# Voice embedding layout: per-feature slices into one fixed-size vector.
+# spectral_contrast uses librosa's default six bands plus the residual row.
+VOICE_EMBEDDING_SLOTS = {
+    'spectral_centroid': slice(0, 1),
+    'spectral_rolloff': slice(1, 2),
+    'spectral_contrast': slice(2, 9),
+    'mfcc': slice(9, 22),
+}
+VOICE_EMBEDDING_SIZE = 22
+
+@lru_cache(maxsize=8)
+def _mel_basis(sr: int, n_fft: int) -> np.ndarray:
+    """Mel filterbank for (sr, n_fft), built once and shared read-only"""
+    basis = librosa.filters.mel(sr=sr, n_fft=n_fft)
+    basis.flags.writeable = False
+    return basis
+
+def _voice_spectra(audio: np.ndarray, sr: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Magnitude STFT and log-mel spectrogram shared by the spectral extractors"""
+    S = np.abs(librosa.stft(audio, dtype=np.complex64))
+    log_mel = librosa.power_to_db(_mel_basis(sr, 2048) @ (S ** 2))
+    return S, log_mel
+
 class RVCVoiceCloner:
     def __init__(self, rvc_path="./Retrieval-based-Voice-Conversion-WebUI"):
         self.rvc_path = Path(rvc_path)
@@ -32,6 +64,10 @@ class RVCVoiceCloner:
         self.storage_path = Path("./storage/voices")
         self.storage_path.mkdir(parents=True, exist_ok=True)
         
+        # Resolve the TTS binary once; a missing espeak goes straight to the
+        # silence fallback instead of forking a doomed subprocess per call
+        self.espeak_path = shutil.which("espeak")
+        
         # Ensure RVC dependencies are available
         self.setup_rvc_environment()
     
@@ -54,23 +90,30 @@ class RVCVoiceCloner:
     
     def preprocess_audio(self, audio_path: str, target_sr: int = 16000) -> str:
         """Preprocess audio file for RVC training"""
+        output_path, _ = self._preprocess_audio(audio_path, target_sr)
+        return output_path
+    
+    def _preprocess_audio(self, audio_path: str, target_sr: int = 16000,
+                          output_path: Optional[Path] = None) -> Tuple[str, np.ndarray]:
+        """Preprocess audio, returning both the saved path and the trimmed samples"""
         try:
             # Load audio
-            audio, sr = librosa.load(audio_path, sr=target_sr)
+            audio, sr = load_audio(audio_path, target_sr)
             
             # Normalize audio
-            audio = librosa.util.normalize(audio)
+            audio = peak_normalize(audio)
             
             # Remove silence
             intervals = librosa.effects.split(audio, top_db=20)
             audio_trimmed = np.concatenate([audio[start:end] for start, end in intervals])
             
             # Save preprocessed audio
-            output_path = self.storage_path / f"preprocessed_{Path(audio_path).stem}.wav"
+            if output_path is None:
+                output_path = self.storage_path / f"preprocessed_{Path(audio_path).stem}.wav"
             sf.write(output_path, audio_trimmed, target_sr)
             
             logger.info(f"Audio preprocessed: {output_path}")
-            return str(output_path)
+            return str(output_path), audio_trimmed
             
         except Exception as e:
             logger.error(f"Audio preprocessing failed: {e}")
@@ -83,20 +126,57 @@ class RVCVoiceCloner:
             voice_dir = self.storage_path / "models" / voice_id
             voice_dir.mkdir(parents=True, exist_ok=True)
             
-            # Preprocess audio
-            preprocessed_path = self.preprocess_audio(audio_path)
-            
-            # Extract F0 features
             f0_path = voice_dir / f"{voice_id}_f0.npy"
-            self.extract_f0(preprocessed_path, f0_path)
-            
-            # Extract content features
             content_path = voice_dir / f"{voice_id}_content.npy"
-            self.extract_content_features(preprocessed_path, content_path)
-            
-            # Create voice embedding
             embedding_path = voice_dir / f"{voice_id}_embedding.npy"
-            self.create_voice_embedding(preprocessed_path, embedding_path)
+            
+            # Keyed on voice_id: voices whose sources share a filename must
+            # not share a preprocessed clip
+            cached_path = self.storage_path / f"preprocessed_{voice_id}.wav"
+            
+            # The sidecar records which source the saved features came from;
+            # if it still matches, skip decoding and all three extractors
+            source_path = voice_dir / f"{voice_id}_source.json"
+            source = self._source_signature(audio_path)
+            outputs = (cached_path, f0_path, content_path, embedding_path)
+            if self._features_current(source_path, source, outputs):
+                logger.info(f"Voice features for {voice_id} are up to date")
+                return {
+                    "voice_id": voice_id,
+                    "f0_path": str(f0_path),
+                    "content_path": str(content_path),
+                    "embedding_path": str(embedding_path),
+                    "audio_path": str(cached_path),
+                    "status": "success"
+                }
+            
+            # Drop the old sidecar first, so a failed run cannot leave it
+            # vouching for a mix of old and new outputs
+            source_path.unlink(missing_ok=True)
+            
+            # Preprocess audio; the trimmed samples stay in memory for the
+            # extractors instead of being decoded back from the saved WAV
+            sr = 16000
+            preprocessed_path, audio = self._preprocess_audio(audio_path, sr, cached_path)
+            
+            # Build the STFT/log-mel that content and embedding both consume
+            spectra = _voice_spectra(audio, sr)
+            
+            # F0, content features and the embedding only read the decoded
+            # clip, and their numpy/FFT kernels release the GIL, so run the
+            # three extractors side by side
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                tasks = [
+                    executor.submit(self.extract_f0, preprocessed_path, f0_path, audio=audio),
+                    executor.submit(self.extract_content_features, preprocessed_path, content_path,
+                                    audio=audio, spectra=spectra),
+                    executor.submit(self.create_voice_embedding, preprocessed_path, embedding_path,
+                                    audio=audio, spectra=spectra),
+                ]
+                for task in tasks:
+                    task.result()
+            
+            write_json(source, source_path)
             
             return {
                 "voice_id": voice_id,
@@ -111,62 +191,92 @@ class RVCVoiceCloner:
             logger.error(f"Feature extraction failed: {e}")
             return {"voice_id": voice_id, "status": "error", "error": str(e)}
     
-    def extract_f0(self, audio_path: str, output_path: str):
+    @staticmethod
+    def _source_signature(audio_path: str) -> Dict[str, Any]:
+        """Resolved path, size and mtime identifying a feature source file"""
+        resolved = Path(audio_path).resolve()
+        st = resolved.stat()
+        return {"path": str(resolved), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    
+    @staticmethod
+    def _features_current(source_path: Path, source: Dict[str, Any], outputs) -> bool:
+        """True if the sidecar matches source and every output exists"""
+        try:
+            recorded = read_json(source_path)
+        except (OSError, ValueError):
+            return False
+        return recorded == source and all(os.path.exists(path) for path in outputs)
+    
+    def extract_f0(self, audio_path: str, output_path: str, audio: Optional[np.ndarray] = None):
         """Extract F0 (pitch) features"""
         try:
-            # Load audio
-            audio, sr = librosa.load(audio_path, sr=16000)
+            # Load audio unless the caller already decoded it
+            sr = 16000
+            if audio is None:
+                audio, sr = load_audio(audio_path, sr)
+            audio = np.ascontiguousarray(audio, dtype=np.float32)
             
             # Extract F0 using librosa
             f0 = librosa.yin(audio, fmin=80, fmax=400, frame_length=1024)
             
-            # Save F0 features
-            np.save(output_path, f0)
+            # Save F0 features; YIN returns float64, float32 keeps ample
+            # precision for pitches in the 80-400 Hz range at half the size
+            np.save(output_path, f0.astype(np.float32, copy=False), allow_pickle=False)
             logger.info(f"F0 features saved to {output_path}")
             
         except Exception as e:
             logger.error(f"F0 extraction failed: {e}")
             raise
     
-    def extract_content_features(self, audio_path: str, output_path: str):
+    def extract_content_features(self, audio_path: str, output_path: str, audio: Optional[np.ndarray] = None,
+                                 spectra: Optional[Tuple[np.ndarray, np.ndarray]] = None):
         """Extract content features using HuBERT"""
         try:
-            # Load audio
-            audio, sr = librosa.load(audio_path, sr=16000)
+            # Load audio unless the caller already decoded it
+            sr = 16000
+            if audio is None:
+                audio, sr = load_audio(audio_path, sr)
+            audio = np.ascontiguousarray(audio, dtype=np.float32)
             
             # Extract MFCC features as content representation
-            mfcc = librosa.feature.mfcc(y=audio, sr=sr, n_mfcc=256)
+            _, log_mel = spectra if spectra is not None else _voice_spectra(audio, sr)
+            mfcc = librosa.feature.mfcc(S=log_mel, n_mfcc=256)
             
             # Save content features
-            np.save(output_path, mfcc)
+            np.save(output_path, mfcc.astype(np.float32, copy=False), allow_pickle=False)
             logger.info(f"Content features saved to {output_path}")
             
         except Exception as e:
             logger.error(f"Content feature extraction failed: {e}")
             raise
     
-    def create_voice_embedding(self, audio_path: str, output_path: str):
+    def create_voice_embedding(self, audio_path: str, output_path: str, audio: Optional[np.ndarray] = None,
+                               spectra: Optional[Tuple[np.ndarray, np.ndarray]] = None):
         """Create voice embedding for speaker identification"""
         try:
-            # Load audio
-            audio, sr = librosa.load(audio_path, sr=16000)
-            
-            # Extract spectral features
-            spectral_centroid = librosa.feature.spectral_centroid(y=audio, sr=sr)
-            spectral_rolloff = librosa.feature.spectral_rolloff(y=audio, sr=sr)
-            spectral_contrast = librosa.feature.spectral_contrast(y=audio, sr=sr)
-            mfcc = librosa.feature.mfcc(y=audio, sr=sr, n_mfcc=13)
-            
-            # Combine features
-            embedding = np.concatenate([
-                np.mean(spectral_centroid, axis=1),
-                np.mean(spectral_rolloff, axis=1),
-                np.mean(spectral_contrast, axis=1),
-                np.mean(mfcc, axis=1)
-            ])
+            # Load audio unless the caller already decoded it
+            sr = 16000
+            if audio is None:
+                audio, sr = load_audio(audio_path, sr)
+            audio = np.ascontiguousarray(audio, dtype=np.float32)
+            
+            # Extract spectral features from one shared magnitude STFT rather
+            # than letting each librosa feature recompute its own
+            S, log_mel = spectra if spectra is not None else _voice_spectra(audio, sr)
+            features = {
+                'spectral_centroid': librosa.feature.spectral_centroid(S=S, sr=sr),
+                'spectral_rolloff': librosa.feature.spectral_rolloff(S=S, sr=sr),
+                'spectral_contrast': librosa.feature.spectral_contrast(S=S, sr=sr),
+                'mfcc': librosa.feature.mfcc(S=log_mel, n_mfcc=13)
+            }
+            
+            # Average each feature straight into its slot of the embedding
+            embedding = np.empty(VOICE_EMBEDDING_SIZE, dtype=np.float32)
+            for name, slot in VOICE_EMBEDDING_SLOTS.items():
+                np.mean(features[name], axis=1, out=embedding[slot])
             
             # Save embedding
-            np.save(output_path, embedding)
+            np.save(output_path, embedding, allow_pickle=False)
             logger.info(f"Voice embedding saved to {output_path}")
             
         except Exception as e:
@@ -207,8 +317,10 @@ class RVCVoiceCloner:
             output_path = self.storage_path / f"tts_{voice_id}_{hash(text)}.wav"
             
             # Use espeak for basic TTS
+            if not self.espeak_path:
+                raise FileNotFoundError("espeak not found on PATH")
             subprocess.run([
-                "espeak", "-w", str(output_path), "-s", "150", text
+                self.espeak_path, "-w", str(output_path), "-s", "150", text
             ], check=True, capture_output=True)
             
             logger.info(f"TTS generated: {output_path}")
@@ -217,24 +329,20 @@ class RVCVoiceCloner:
         except Exception as e:
             logger.error(f"TTS generation failed: {e}")
             # Create silence as fallback
-            silence = np.zeros(16000)  # 1 second of silence
             output_path = self.storage_path / f"tts_fallback_{voice_id}.wav"
-            sf.write(output_path, silence, 16000)
+            sf.write(output_path, _SILENCE, 16000)
             return str(output_path)
     
     def apply_voice_conversion(self, audio_path: str, voice_id: str, target_voice_path: str = None) -> str:
         """Apply voice conversion using RVC model"""
         try:
             # Load source audio
-            audio, sr = librosa.load(audio_path, sr=16000)
+            audio, sr = load_audio(audio_path, 16000)
             
             # Load voice model features
-            voice_dir = self.storage_path / "models" / voice_id
-            embedding_path = voice_dir / f"{voice_id}_embedding.npy"
+            embedding = self.load_voice_embedding(voice_id)
             
-            if embedding_path.exists():
-                embedding = np.load(embedding_path)
-                
+            if embedding is not None:
                 # Apply voice characteristics (simplified)
                 # In a real implementation, this would use the trained RVC model
                 converted_audio = self.apply_voice_characteristics(audio, embedding)
@@ -253,6 +361,13 @@ class RVCVoiceCloner:
             # Return original audio as fallback
             return audio_path
     
+    def load_voice_embedding(self, voice_id: str) -> Optional[np.ndarray]:
+        """Load a saved voice embedding, or None if the voice has none"""
+        embedding_path = self.storage_path / "models" / voice_id / f"{voice_id}_embedding.npy"
+        if not embedding_path.exists():
+            return None
+        return np.load(embedding_path, allow_pickle=False)
+    
     def apply_voice_characteristics(self, audio: np.ndarray, embedding: np.ndarray) -> np.ndarray:
         """Apply voice characteristics based on embedding"""
         try:
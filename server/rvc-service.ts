@@ -1,5 +1,6 @@
 import { spawn } from 'child_process';
 import { promises as fs } from 'fs';
+import os from 'os';
 import path from 'path';
 
 export interface VoiceCloneRequest {
@@ -22,6 +23,29 @@ export class RVCService {
   private outputDir = './storage/voices';
   private pythonPath = 'python3';
 
+  // Cap concurrent RVC processes at the CPU count; extra requests queue
+  private maxConcurrent = Math.max(1, os.cpus().length);
+  private activeProcesses = 0;
+  private waitQueue: Array<() => void> = [];
+
+  private async acquireSlot(): Promise<void> {
+    if (this.activeProcesses < this.maxConcurrent) {
+      this.activeProcesses++;
+      return;
+    }
+    // The releasing process hands its slot straight to the next waiter
+    await new Promise<void>((resolve) => this.waitQueue.push(resolve));
+  }
+
+  private releaseSlot(): void {
+    const next = this.waitQueue.shift();
+    if (next) {
+      next();
+    } else {
+      this.activeProcesses--;
+    }
+  }
+
   async cloneVoice(request: VoiceCloneRequest): Promise<VoiceCloneResult> {
     try {
       // Ensure output directory exists
@@ -71,6 +95,15 @@ export class RVCService {
   }
 
   private async executeRVCScript(args: string[]): Promise<{ success: boolean; error?: string; result?: any }> {
+    await this.acquireSlot();
+    try {
+      return await this.runRVCProcess(args);
+    } finally {
+      this.releaseSlot();
+    }
+  }
+
+  private runRVCProcess(args: string[]): Promise<{ success: boolean; error?: string; result?: any }> {
     return new Promise((resolve) => {
       // Use our Python RVC integration script
       const pythonScript = './server/rvc-integration.py';
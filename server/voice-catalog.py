@@ -5,12 +5,13 @@ Voice Catalog Manager for Burnt Beats
 Manages and displays available voice samples
 """
 
-import json
 import os
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 import logging
 
+from json_utils import read_json, write_json
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -21,6 +22,10 @@ class VoiceCatalog:
         self.voice_bank_path = Path("storage/voice-bank/samples")
         self.analysis_path = Path("mir-data/voice_analysis")
         self.catalog_file = self.analysis_path / "voice_catalog.json"
+        # *_processing.json names in analysis_path, mapped to their parsed
+        # data once read, and the directory mtime_ns the listing was taken at
+        self._analysis_cache: Dict[str, Optional[Dict]] = {}
+        self._analysis_mtime: Optional[int] = None
         
     def get_available_voices(self) -> List[Dict]:
         """Get list of available voice samples with metadata"""
@@ -29,26 +34,32 @@ class VoiceCatalog:
         if not self.voice_bank_path.exists():
             return voices
         
-        # Find all audio files
-        audio_extensions = ['.mp3', '.wav', '.flac', '.m4a']
+        # Find all audio files in one directory pass; DirEntry caches the
+        # type and stat results, so each voice costs a single stat call
+        audio_extensions = {'.mp3', '.wav', '.flac', '.m4a'}
+        
+        analysis_files = self._analysis_index()
         
-        for ext in audio_extensions:
-            for audio_file in self.voice_bank_path.glob(f"*{ext}"):
+        with os.scandir(self.voice_bank_path) as entries:
+            for entry in entries:
+                stem, suffix = os.path.splitext(entry.name)
+                if suffix not in audio_extensions or not entry.is_file():
+                    continue
+                
                 voice_info = {
-                    "id": audio_file.stem.replace(' ', '_').lower(),
-                    "name": audio_file.stem.replace('_', ' ').title(),
-                    "file_path": str(audio_file),
-                    "file_size": audio_file.stat().st_size,
-                    "format": audio_file.suffix.lower(),
+                    "id": stem.replace(' ', '_').lower(),
+                    "name": stem.replace('_', ' ').title(),
+                    "file_path": str(self.voice_bank_path / entry.name),
+                    "file_size": entry.stat().st_size,
+                    "format": suffix.lower(),
                     "available_for_cloning": True
                 }
                 
                 # Add analysis data if available
-                analysis_file = self.analysis_path / f"{voice_info['id']}_processing.json"
-                if analysis_file.exists():
+                analysis_name = f"{voice_info['id']}_processing.json"
+                if analysis_name in analysis_files:
                     try:
-                        with open(analysis_file, 'r') as f:
-                            analysis_data = json.load(f)
+                        analysis_data = self._load_analysis(analysis_name)
                         voice_info.update({
                             "duration": analysis_data.get("total_duration", 0),
                             "chunk_count": analysis_data.get("chunk_count", 0),
@@ -62,6 +73,34 @@ class VoiceCatalog:
         
         return sorted(voices, key=lambda x: x['name'])
     
+    def _analysis_index(self) -> Dict[str, Optional[Dict]]:
+        """Processing metadata in analysis_path, relisted only when it changes"""
+        # write_json replaces files by rename, so any new or rewritten
+        # analysis bumps the directory mtime; one stat covers every file.
+        # Only correct while every *_processing.json is written through
+        # json_utils.write_json: an in-place rewrite leaves the directory
+        # mtime alone and the stale parse would be served.
+        try:
+            mtime_ns = os.stat(self.analysis_path).st_mtime_ns
+        except OSError:
+            return {}
+        if mtime_ns != self._analysis_mtime:
+            with os.scandir(self.analysis_path) as entries:
+                self._analysis_cache = {
+                    entry.name: None
+                    for entry in entries if entry.name.endswith('_processing.json')
+                }
+            self._analysis_mtime = mtime_ns
+        return self._analysis_cache
+    
+    def _load_analysis(self, analysis_name: str) -> Dict:
+        """Parse a voice's processing metadata once per directory listing"""
+        analysis_data = self._analysis_cache[analysis_name]
+        if analysis_data is None:
+            analysis_data = read_json(self.analysis_path / analysis_name)
+            self._analysis_cache[analysis_name] = analysis_data
+        return analysis_data
+    
     def get_voice_by_id(self, voice_id: str) -> Dict:
         """Get specific voice by ID"""
         voices = self.get_available_voices()
@@ -76,13 +115,12 @@ class VoiceCatalog:
             voices = self.get_available_voices()
             catalog_data = {
                 "voice_count": len(voices),
-                "last_updated": str(Path().stat().st_mtime),
+                "last_updated": str(os.path.getmtime(".")),
                 "voices": voices
             }
             
             self.analysis_path.mkdir(parents=True, exist_ok=True)
-            with open(self.catalog_file, 'w') as f:
-                json.dump(catalog_data, f, indent=2)
+            write_json(catalog_data, self.catalog_file)
             
             return True
         except Exception as e:
@@ -93,8 +131,7 @@ class VoiceCatalog:
         """Load voice catalog from file"""
         if self.catalog_file.exists():
             try:
-                with open(self.catalog_file, 'r') as f:
-                    return json.load(f)
+                return read_json(self.catalog_file)
             except Exception as e:
                 logger.error(f"Error loading catalog: {e}")
         
@@ -7,16 +7,44 @@ Processes real voice samples for voice cloning
 
 import os
 import json
+import multiprocessing
 import librosa
 import soundfile as sf
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 import logging
 
+from audio_utils import load_audio, peak_normalize
+from json_utils import read_json, write_json
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _mean_peak_pitch(S: np.ndarray, sr: int, n_fft: int = 2048,
+                     fmin: float = 150.0, fmax: float = 4000.0,
+                     threshold: float = 0.1) -> float:
+    """Mean frequency of the spectral peaks in [fmin, fmax), 0 if none"""
+    # Same peak rule and defaults as librosa.piptrack, but only the band
+    # rows are compared and only the peaks themselves are interpolated,
+    # instead of filling full (freq x frame) pitch and magnitude grids
+    lo = max(1, int(np.ceil(fmin * n_fft / sr)))
+    hi = min(S.shape[0] - 1, int(np.ceil(fmax * n_fft / sr)))
+    band = S[lo - 1:hi + 1]
+    a, b, c = band[:-2], band[1:-1], band[2:]
+    peaks = (b > a) & (b >= c) & (b > threshold * S.max(axis=0))
+    rows, _ = np.nonzero(peaks)
+    if rows.size == 0:
+        return 0.0
+    
+    # Three-point parabolic interpolation around each peak bin
+    a, b, c = a[peaks], b[peaks], c[peaks]
+    curvature = a - 2 * b + c
+    safe = np.where(curvature != 0, curvature, 1)
+    delta = np.where(curvature != 0, 0.5 * (a - c) / safe, 0)
+    return float(((rows + lo + delta) * sr / n_fft).mean())
+
 class VoiceSampleProcessor:
     """Process voice samples for RVC training and cloning"""
     
@@ -26,39 +54,71 @@ class VoiceSampleProcessor:
         self.analysis_path = Path("mir-data/voice_analysis")
         self.target_sr = 22050
         self.chunk_duration = 10.0  # seconds
+        self.write_workers = min(4, os.cpu_count() or 1)
+        # Quality statistics are taken over a centered window of this many
+        # seconds; None analyzes the whole clip
+        self.stat_window_s = 30.0
+        
+        # STFT output buffer reused across samples; grown to the longest clip
+        self._stft_buf = None
         
         # Ensure directories exist
         for path in [self.processed_path, self.analysis_path]:
             path.mkdir(parents=True, exist_ok=True)
     
-    def analyze_voice_sample(self, audio_path: str) -> Dict:
+    def _stft_magnitude(self, audio: np.ndarray) -> np.ndarray:
+        """Magnitude STFT (librosa defaults) computed into the reusable buffer"""
+        n_fft, hop_length = 2048, 512
+        n_frames = 1 + len(audio) // hop_length
+        if self._stft_buf is None or self._stft_buf.shape[1] < n_frames:
+            self._stft_buf = np.empty((1 + n_fft // 2, n_frames), dtype=np.complex64)
+        # librosa fills (and returns) only the prefix it needs of a larger buffer
+        stft = librosa.stft(np.ascontiguousarray(audio, dtype=np.float32),
+                            n_fft=n_fft, hop_length=hop_length,
+                            dtype=np.complex64, out=self._stft_buf)
+        return np.abs(stft)
+    
+    def analyze_voice_sample(self, audio_path: str, audio: Optional[np.ndarray] = None) -> Dict:
         """Analyze voice sample quality and characteristics"""
         try:
-            # Load audio
-            audio, sr = librosa.load(audio_path, sr=self.target_sr)
+            # Load audio unless the caller already decoded it
+            sr = self.target_sr
+            if audio is None:
+                audio, sr = load_audio(audio_path, sr)
             duration = len(audio) / sr
             
-            # Basic audio analysis
+            # Summary statistics settle well within half a minute, so long
+            # samples are analyzed over a centered window only
+            if self.stat_window_s is not None:
+                window = int(self.stat_window_s * sr)
+                start = max(0, (len(audio) - window) // 2)
+                audio = audio[start:start + window]
+            
+            # Basic audio analysis; centroid and pitch tracking share one
+            # magnitude STFT
+            S = self._stft_magnitude(audio)
             rms = librosa.feature.rms(y=audio)[0]
-            spectral_centroid = librosa.feature.spectral_centroid(y=audio, sr=sr)[0]
+            spectral_centroid = librosa.feature.spectral_centroid(S=S, sr=sr)[0]
             zero_crossing_rate = librosa.feature.zero_crossing_rate(audio)[0]
             
             # Voice-specific features
-            pitches, magnitudes = librosa.piptrack(y=audio, sr=sr)
-            pitch_mean = np.mean(pitches[pitches > 0]) if np.any(pitches > 0) else 0
+            pitch_mean = _mean_peak_pitch(S, sr)
             
-            # Quality metrics
-            snr_estimate = np.mean(rms) / (np.std(rms) + 1e-8)
+            # Quality metrics; each reduction runs once and is kept as a
+            # Python float so the derived flags are plain bools
+            rms_mean = float(rms.mean())
+            rms_std = float(rms.std())
+            snr_estimate = rms_mean / (rms_std + 1e-8)
             
             analysis = {
                 "duration": float(duration),
                 "sample_rate": sr,
-                "rms_mean": float(np.mean(rms)),
-                "rms_std": float(np.std(rms)),
+                "rms_mean": rms_mean,
+                "rms_std": rms_std,
                 "pitch_mean": float(pitch_mean),
-                "spectral_centroid_mean": float(np.mean(spectral_centroid)),
-                "zero_crossing_rate_mean": float(np.mean(zero_crossing_rate)),
-                "snr_estimate": float(snr_estimate),
+                "spectral_centroid_mean": float(spectral_centroid.mean()),
+                "zero_crossing_rate_mean": float(zero_crossing_rate.mean()),
+                "snr_estimate": snr_estimate,
                 "suitable_for_rvc": duration > 5.0 and snr_estimate > 2.0,
                 "quality_score": min(10.0, snr_estimate * 2.0),
                 "recommended_for_training": duration > 30.0 and snr_estimate > 3.0
@@ -70,14 +130,17 @@ class VoiceSampleProcessor:
             logger.error(f"Error analyzing voice sample {audio_path}: {e}")
             return {"error": str(e)}
     
-    def preprocess_for_rvc(self, audio_path: str, voice_id: str) -> Dict:
+    def preprocess_for_rvc(self, audio_path: str, voice_id: str,
+                           audio: Optional[np.ndarray] = None) -> Dict:
         """Preprocess voice sample for RVC training"""
         try:
-            # Load and normalize audio
-            audio, sr = librosa.load(audio_path, sr=self.target_sr)
+            # Load (unless already decoded) and normalize audio
+            sr = self.target_sr
+            if audio is None:
+                audio, sr = load_audio(audio_path, sr)
             
             # Normalize audio level
-            audio = librosa.util.normalize(audio)
+            audio = peak_normalize(audio)
             
             # Remove silence
             audio, _ = librosa.effects.trim(audio, top_db=20)
@@ -94,12 +157,16 @@ class VoiceSampleProcessor:
             else:
                 chunks = [audio]
             
-            # Save processed chunks
-            output_files = []
-            for i, chunk in enumerate(chunks):
-                output_file = self.processed_path / f"{voice_id}_chunk_{i:03d}.wav"
-                sf.write(output_file, chunk, sr)
-                output_files.append(str(output_file))
+            # Save processed chunks; libsndfile releases the GIL while
+            # encoding, so chunk writes overlap on a small writer pool
+            output_paths = [
+                self.processed_path / f"{voice_id}_chunk_{i:03d}.wav"
+                for i in range(len(chunks))
+            ]
+            with ThreadPoolExecutor(max_workers=self.write_workers) as writer:
+                list(writer.map(lambda args: sf.write(args[0], args[1], sr),
+                                zip(output_paths, chunks)))
+            output_files = [str(path) for path in output_paths]
             
             processing_result = {
                 "voice_id": voice_id,
@@ -108,13 +175,12 @@ class VoiceSampleProcessor:
                 "chunk_count": len(chunks),
                 "total_duration": len(audio) / sr,
                 "sample_rate": sr,
-                "processing_date": str(Path(audio_path).stat().st_mtime)
+                "processing_date": str(os.path.getmtime(audio_path))
             }
             
             # Save processing metadata
             metadata_file = self.analysis_path / f"{voice_id}_processing.json"
-            with open(metadata_file, 'w') as f:
-                json.dump(processing_result, f, indent=2)
+            write_json(processing_result, metadata_file)
             
             return processing_result
             
@@ -142,38 +208,74 @@ class VoiceSampleProcessor:
         
         logger.info(f"Found {len(audio_files)} voice samples to process")
         
-        for audio_file in audio_files:
-            try:
-                # Generate voice ID from filename
-                voice_id = audio_file.stem.replace(' ', '_').lower()
-                
-                logger.info(f"Processing voice sample: {voice_id}")
-                
-                # Analyze sample
-                analysis = self.analyze_voice_sample(str(audio_file))
-                analysis['voice_id'] = voice_id
-                analysis['original_file'] = str(audio_file)
-                results['analysis_results'].append(analysis)
-                
-                # Preprocess for RVC if suitable
-                if analysis.get('suitable_for_rvc', False):
-                    processing_result = self.preprocess_for_rvc(str(audio_file), voice_id)
-                    results['processed_voices'].append(processing_result)
-                else:
-                    logger.warning(f"Voice sample {voice_id} not suitable for RVC training")
-                
-            except Exception as e:
-                error_msg = f"Error processing {audio_file}: {e}"
-                logger.error(error_msg)
-                results['errors'].append(error_msg)
+        # Samples are independent and CPU-bound in librosa, so spread them
+        # across processes; each worker builds a processor with this one's
+        # settings and keeps it (and its STFT buffer) for every sample it is
+        # handed. Workers are spawned rather than forked so they never
+        # inherit BLAS/FFT thread pools already started in this process.
+        if audio_files:
+            workers = min(len(audio_files), os.cpu_count() or 1)
+            ctx = multiprocessing.get_context("spawn")
+            with ctx.Pool(workers, initializer=_init_worker,
+                          initargs=(self._worker_settings(),)) as pool:
+                for outcome in pool.imap_unordered(_process_in_worker, audio_files):
+                    if 'error' in outcome:
+                        results['errors'].append(outcome['error'])
+                        continue
+                    results['analysis_results'].append(outcome['analysis'])
+                    if 'processing' in outcome:
+                        results['processed_voices'].append(outcome['processing'])
         
         # Save summary
         summary_file = self.analysis_path / "voice_processing_summary.json"
-        with open(summary_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        write_json(results, summary_file)
         
         return results
     
+    def _worker_settings(self) -> Dict:
+        """Configuration a worker process needs to mirror this processor"""
+        return {
+            "voice_bank_path": self.voice_bank_path,
+            "processed_path": self.processed_path,
+            "analysis_path": self.analysis_path,
+            "target_sr": self.target_sr,
+            "chunk_duration": self.chunk_duration,
+            # The pool already runs one process per core; a chunk writer
+            # pool in each would oversubscribe the CPU with encoders
+            "write_workers": 1,
+            "stat_window_s": self.stat_window_s,
+        }
+    
+    def _process_sample(self, audio_file: Path) -> Dict:
+        """Analyze one voice sample and preprocess it if it is usable"""
+        try:
+            # Generate voice ID from filename
+            voice_id = audio_file.stem.replace(' ', '_').lower()
+            
+            logger.info(f"Processing voice sample: {voice_id}")
+            
+            # Decode once; analysis and preprocessing share the samples
+            audio, _ = load_audio(str(audio_file), self.target_sr)
+            
+            # Analyze sample
+            analysis = self.analyze_voice_sample(str(audio_file), audio=audio)
+            analysis['voice_id'] = voice_id
+            analysis['original_file'] = str(audio_file)
+            outcome = {"analysis": analysis}
+            
+            # Preprocess for RVC if suitable
+            if analysis.get('suitable_for_rvc', False):
+                outcome["processing"] = self.preprocess_for_rvc(str(audio_file), voice_id, audio=audio)
+            else:
+                logger.warning(f"Voice sample {voice_id} not suitable for RVC training")
+            
+            return outcome
+            
+        except Exception as e:
+            error_msg = f"Error processing {audio_file}: {e}"
+            logger.error(error_msg)
+            return {"error": error_msg}
+    
     def get_voice_catalog(self) -> List[Dict]:
         """Get catalog of available voice samples"""
         catalog = []
@@ -181,14 +283,24 @@ class VoiceSampleProcessor:
         if self.analysis_path.exists():
             for analysis_file in self.analysis_path.glob("*_processing.json"):
                 try:
-                    with open(analysis_file, 'r') as f:
-                        voice_data = json.load(f)
-                    catalog.append(voice_data)
+                    catalog.append(read_json(analysis_file))
                 except Exception as e:
                     logger.error(f"Error reading {analysis_file}: {e}")
         
         return catalog
 
+# Per-process state for the process_all_samples worker pool
+_worker_processor = None
+
+def _init_worker(settings: Dict):
+    global _worker_processor
+    _worker_processor = VoiceSampleProcessor()
+    for name, value in settings.items():
+        setattr(_worker_processor, name, value)
+
+def _process_in_worker(audio_file: Path) -> Dict:
+    return _worker_processor._process_sample(audio_file)
+
 def main():
     """CLI interface for voice sample processing"""
     import argparse
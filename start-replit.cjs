@@ -1,6 +1,7 @@
 // Startup script for Replit
 const { execSync } = require('child_process');
 const fs = require('fs');
+const net = require('net');
 const path = require('path');
 
 console.log('🚀 Starting BurntBeatz server...');
@@ -28,12 +29,30 @@ if (!fs.existsSync(indexPath)) {
 process.env.NODE_ENV = 'production';
 process.env.PORT = process.env.PORT || '5000';
 
-// Start the server
-console.log('🚀 Starting server...');
-try {
-    process.chdir(distPath);
-    require(indexPath);
-} catch (error) {
-    console.error('❌ Failed to start server:', error);
-    process.exit(1);
-}
\ No newline at end of file
+// Probe the port with a throwaway bind before loading the bundle; this is
+// syscall-only (no TCP handshake) and fails fast instead of after the
+// whole server has been required and initialised
+function checkPortFree(port, callback) {
+    const probe = net.createServer();
+    probe.once('error', (error) => callback(error.code !== 'EADDRINUSE'));
+    probe.once('listening', () => probe.close(() => callback(true)));
+    probe.listen(port, '0.0.0.0');
+}
+
+const port = Number(process.env.PORT) || 5000;
+checkPortFree(port, (free) => {
+    if (!free) {
+        console.error(`❌ Port ${port} is already in use`);
+        process.exit(1);
+    }
+
+    // Start the server
+    console.log('🚀 Starting server...');
+    try {
+        process.chdir(distPath);
+        require(indexPath);
+    } catch (error) {
+        console.error('❌ Failed to start server:', error);
+        process.exit(1);
+    }
+});
\ No newline at end of file
@@ -82,9 +82,7 @@ ${suite.tests.filter(t => t.status === 'failed').map(test => `
 ## Performance Metrics
 - Average test duration: ${(totalDuration / totalTests).toFixed(2)}ms
 - Slowest tests:
-${this.results.flatMap(suite => suite.tests)
-  .sort((a, b) => b.duration - a.duration)
-  .slice(0, 5)
+${this.slowestTests(5)
   .map(test => `  - ${test.suite}:${test.test} (${test.duration}ms)`)
   .join('\n')}
 
@@ -95,6 +93,22 @@ ${this.checkQualityGates(passedTests, totalTests, failedTests)}
     return report;
   }
 
+  private slowestTests(limit: number): TestResult[] {
+    // Keep a small descending window of the slowest tests instead of
+    // sorting every result just to take the first few
+    const slowest: TestResult[] = [];
+    for (const suite of this.results) {
+      for (const test of suite.tests) {
+        if (slowest.length === limit && test.duration <= slowest[limit - 1].duration) continue;
+        let i = slowest.length;
+        while (i > 0 && slowest[i - 1].duration < test.duration) i--;
+        slowest.splice(i, 0, test);
+        if (slowest.length > limit) slowest.pop();
+      }
+    }
+    return slowest;
+  }
+
   private checkQualityGates(passed: number, total: number, failed: number): string {
     const passRate = passed / total;
     const gates = [